@@ -0,0 +1,10 @@
+"""Offline benchmarks against HTML fixtures of `tests`."""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STUBS = os.path.join(ROOT, "tests", "stubs")
+
+# Addon modules import Kodi modules: headless stubs are used instead.
+sys.path[:0] = [x for x in (ROOT, STUBS) if x not in sys.path]
@@ -0,0 +1,151 @@
+"""Benchmark harness reporting throughput and peak memory.
+
+Results are compared with committed `baseline.json`: throughput below or
+peak memory above baseline by more than tolerance is a regression and
+fails the run. Throughput is compared relative to fixed calibration
+workload measured next to each benchmark, so baseline saved with `--save`
+holds on slower machines. Shared CI runners are noisy, so default
+throughput tolerance is wide: use `--tolerance` on quiet machine to catch
+smaller slowdowns. Peak memory is deterministic, but object sizes differ
+between Python versions: baseline is saved with Python 3.8 as in CI."""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from . import ROOT
+
+FIXTURES = os.path.join(ROOT, "tests", "fixtures")
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+Benchmarks = Dict[str, Callable[[], object]]
+
+
+class Result(NamedTuple):
+    name: str
+    ops: float
+    """Calls per second (best round)"""
+    score: float
+    """Throughput relative to calibration workload"""
+    peak: int
+    """Peak traced memory of one call in bytes"""
+
+
+def fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, f"{name}.html"), encoding="utf-8") as f:
+        return f.read()
+
+
+def _calibration() -> None:
+    # Fixed pure Python workload, close to parsing in nature.
+    words = [str(x * 7919 % 10007) for x in range(2000)]
+    index = {x: len(x) for x in sorted(words)}
+    "".join(x for x in words if index[x] > 3)
+
+
+def _ops(func: Callable[[], object], repeat: int) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()  # at least 0.2 seconds per round
+    return number / min(timer.repeat(repeat, number))
+
+
+def measure(name: str, func: Callable[[], object], repeat: int = 5) -> Result:
+    # Calibration runs around benchmark to follow machine load.
+    speed = _ops(_calibration, repeat)
+    ops = _ops(func, repeat)
+    speed = max(speed, _ops(_calibration, repeat))
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    return Result(name, ops, ops / speed, peak)
+
+
+def _load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+
+    except OSError:
+        return {}
+
+
+def _change(value: float, base: Optional[float]) -> str:
+    return f"{value / base - 1:+7.1%}" if base else "      -"
+
+
+def report(
+    results: Sequence[Result],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+    memory_tolerance: float,
+) -> List[str]:
+    """Prints results table. Returns names of regressed benchmarks."""
+
+    width = max(len(x.name) for x in results)
+    change = f"{'change':>7}"
+    print(f"{'benchmark':{width}}  {'ops/s':>10} {change}  {'peak KiB':>9} {change}")
+    regressed = []
+
+    for x in results:
+        base = baseline.get(x.name, {})
+        score, peak = base.get("score"), base.get("peak")
+        slow = score and x.score < score * (1 - tolerance)
+        grown = peak and x.peak > peak * (1 + memory_tolerance)
+        mark = ""
+
+        if slow or grown:
+            regressed.append(x.name)
+            mark = "  REGRESSION"
+
+        print(
+            f"{x.name:{width}}  {x.ops:10.1f} {_change(x.score, score)}"
+            f"  {x.peak / 1024:9.1f} {_change(x.peak, peak)}{mark}"
+        )
+
+    return regressed
+
+
+def main(benchmarks: Benchmarks, argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-k", dest="filter", default="", help="run benchmarks by substring"
+    )
+    parser.add_argument("--save", action="store_true", help="update baseline")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="of throughput")
+    parser.add_argument("--memory-tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    names = [x for x in benchmarks if args.filter in x]
+    results = [measure(x, benchmarks[x]) for x in names]
+    baseline = _load_baseline(args.baseline)
+    regressed = report(results, baseline, args.tolerance, args.memory_tolerance)
+
+    if args.save:
+        for x in results:
+            baseline[x.name] = {"score": float(f"{x.score:.4g}"), "peak": x.peak}
+
+        with open(args.baseline, "w") as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2)
+            f.write("\n")
+
+        return 0
+
+    if regressed:
+        print(f"{len(regressed)} regressions over baseline", file=sys.stderr)
+        return 1
+
+    return 0
@@ -0,0 +1,126 @@
+"""Cold start benchmark: each navigation step runs in fresh interpreter
+as Kodi does, first with empty page cache and then with cached view.
+
+`python -X importtime` report of every run is saved to reports directory.
+Cached views must not import network and HTML parsing stacks.
+
+Usage: python -m benchmarks.imports [--reports DIR]"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Final, List, NamedTuple, Optional, Sequence, Tuple
+
+from . import ROOT, site
+
+HEAVY: Final = ("requests", "bs4", "lxml", "http.server")
+"""Packages not needed to show cached view"""
+
+# Measured process imports nothing but addon and stubs.
+_SCRIPT: Final = """
+import sys
+import benchmarks
+import xbmcaddon
+xbmcaddon.SETTINGS.update({settings!r})
+from resources.lib import addon, zophar
+zophar.set_base_url(sys.argv[1])
+addon.run(sys.argv[2:])
+"""
+
+_IMPORT_LINE: Final = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+class Run(NamedTuple):
+    wall: float
+    """Process wall time in seconds"""
+    imports: float
+    """Total import time in seconds"""
+    modules: int
+    """Number of imported modules"""
+    heavy: Tuple[str, ...]
+    """Imported heavy packages"""
+
+
+def parse_importtime(report: str) -> Run:
+    """Parses `-X importtime` report. Wall time is not known."""
+
+    total, names = 0, set()
+
+    for self_us, _, _, name in _IMPORT_LINE.findall(report):
+        total += int(self_us)
+        names.add(name)
+
+    heavy = tuple(x for x in HEAVY if x in names)
+    return Run(0, total / 1e6, len(names), heavy)
+
+
+def run(args: Sequence[str], env: dict, report: Optional[str] = None) -> Run:
+    """Runs Python with `args` and `-X importtime`. Saves report to file."""
+
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT,
+        env=env,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+
+    if process.returncode:
+        lines = [x for x in process.stderr.splitlines() if x[:12] != "import time:"]
+        raise RuntimeError("\n".join(lines[-20:]))
+
+    if report:
+        with open(report, "w") as f:
+            f.write(process.stderr)
+
+    return parse_importtime(process.stderr)._replace(wall=wall)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", help="directory of importtime reports")
+    args = parser.parse_args(argv)
+
+    reports = args.reports or tempfile.mkdtemp(prefix="importtime-")
+    os.makedirs(reports, exist_ok=True)
+    server = site.serve()
+    env = {**os.environ, "KODI_HOME": tempfile.mkdtemp(prefix="kodi-")}
+    script = _SCRIPT.format(settings=site.SETTINGS)
+    results: List[Tuple[str, Run]] = []
+
+    results.append(("python", run(["-c", "pass"], env)))
+
+    for state in ("cold", "cached"):
+        for name, query in site.NAVIGATION:
+            argv = ["-c", script, server.url, *site.plugin_argv(query)]
+            report = os.path.join(reports, f"{name}-{state}.txt")
+            results.append((f"{name}[{state}]", run(argv, env, report)))
+
+    server.shutdown()
+    print(f"{'run':18}  {'wall ms':>8} {'import ms':>9} {'modules':>7}  heavy")
+
+    for name, x in results:
+        heavy = ",".join(x.heavy) or "-"
+        print(
+            f"{name:18}  {x.wall * 1e3:8.1f} {x.imports * 1e3:9.1f}"
+            f" {x.modules:7}  {heavy}"
+        )
+
+    print(f"importtime reports: {reports}")
+    slow = [x for x, r in results if x.endswith("[cached]") and r.heavy]
+
+    if slow:
+        print(f"cached views import heavy packages: {slow}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
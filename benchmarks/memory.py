@@ -0,0 +1,70 @@
+"""Memory benchmarks of full catalog built in memory from model classes.
+
+Usage: python -m benchmarks.memory [-k FILTER] [--save]"""
+
+from typing import Final, List
+
+from resources.lib.zophar import parsers
+from resources.lib.zophar.parsers import AudioTrack, GameEntry, GameListPage
+
+from .harness import Benchmarks, fixture, main
+
+CATALOG_ENTRIES: Final = 50_000
+"""Number of game entries: all consoles and computers of site"""
+
+CATALOG_GAMES: Final = 2_000
+"""Number of game pages with tracks kept in memory"""
+
+
+def _copy(value):
+    # Parser creates new string for every row: duplicates are not shared.
+    return value if value is None else "".join(list(value))
+
+
+def catalog(rows: List[GameEntry], count: int = CATALOG_ENTRIES) -> List[GameEntry]:
+    """Game entries of catalog with unique names and paths."""
+
+    result = []
+
+    for n in range(count):
+        x = rows[n % len(rows)]
+        result.append(
+            GameEntry(
+                name=f"{x.name} {n}",
+                path=f"{x.path}-{n}",
+                cover=x.cover and f"{x.cover[:-4]}-{n}.jpg",
+                year=_copy(x.year),
+                console=_copy(x.console),
+                developer=_copy(x.developer),
+            )
+        )
+
+    return result
+
+
+def tracks(
+    page: parsers.GamePage, count: int = CATALOG_GAMES
+) -> List[List[AudioTrack]]:
+    """Playlists of `count` game pages."""
+
+    return [
+        [AudioTrack(f"{x.title} {n}", x.length, f"{x.mp3url}?{n}") for x in page.tracks]
+        for n in range(count)
+    ]
+
+
+def benchmarks() -> Benchmarks:
+    page = parsers.parse_page(fixture("search_results"))
+    gamepage = parsers.parse_page(fixture("gamepage"))
+    assert isinstance(page, GameListPage) and isinstance(gamepage, parsers.GamePage)
+    rows = page.entries
+
+    # Peak memory is memory of built catalog: it is alive on return.
+    return {
+        "catalog[entries]": lambda: catalog(rows),
+        "catalog[tracks]": lambda: tracks(gamepage),
+    }
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(benchmarks()))
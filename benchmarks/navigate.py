@@ -0,0 +1,129 @@
+"""End-to-end navigation through addon with headless Kodi stubs and
+offline site.
+
+Every step of navigation sequence (root, submenu, infopage, gamelist,
+gamepage) is plugin invocation in this process. Reported are wall time
+until directory is shown, total time with background work, number of
+requests and memory allocated by step. First round runs with empty page
+cache, next ones show cached views. Allocation tracing slows steps down:
+use `--no-trace` for accurate timings.
+
+Usage: python -m benchmarks.navigate [--rounds N] [--no-trace]
+                                     [--profile FILE]"""
+
+import argparse
+import cProfile
+import pstats
+import sys
+import time
+import tracemalloc
+from typing import List, NamedTuple, Optional, Sequence
+
+import xbmcaddon
+import xbmcplugin
+
+from resources.lib import addon, zophar
+
+from . import site
+
+
+class Step(NamedTuple):
+    name: str
+    items: int
+    """Number of directory items. Negative if directory was not shown."""
+    shown: float
+    """Seconds until directory is shown"""
+    total: float
+    """Seconds of invocation including background work"""
+    requests: int
+    """Number of HTTP requests"""
+    allocated: int
+    """Bytes allocated by step and kept after it"""
+    peak: int
+    """Peak traced memory of step in bytes"""
+
+
+def step(name: str, query: str, trace: bool = True) -> Step:
+    """Runs plugin invocation with `query`."""
+
+    xbmcplugin.reset()
+
+    if trace:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+
+    try:
+        addon.run(site.plugin_argv(query))
+        total = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    ended, items = xbmcplugin.ENDED, len(xbmcplugin.ITEMS)
+    shown = total if ended is None else ended - start
+    requests = len(zophar.get_transport().stats)
+    return Step(name, items if ended else -1, shown, total, requests, current, peak)
+
+
+def navigate(url: str, rounds: int = 2, trace: bool = True) -> List[List[Step]]:
+    """Runs navigation sequence `rounds` times against site at `url`."""
+
+    xbmcaddon.SETTINGS.update(site.SETTINGS)
+    zophar.set_base_url(url)
+    return [[step(*x, trace) for x in site.NAVIGATION] for _ in range(rounds)]
+
+
+def report(results: List[List[Step]]) -> None:
+    print(
+        f"{'step':14} {'items':>5} {'shown ms':>9} {'total ms':>9} {'net':>4}"
+        f" {'alloc KiB':>10} {'peak KiB':>9}"
+    )
+
+    for n, steps in enumerate(results):
+        for x in steps:
+            print(
+                f"{f'{x.name}[{n}]':14} {x.items:5} {x.shown * 1e3:9.1f}"
+                f" {x.total * 1e3:9.1f} {x.requests:4}"
+                f" {x.allocated / 1024:10.1f} {x.peak / 1024:9.1f}"
+            )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--no-trace", dest="trace", action="store_false")
+    parser.add_argument("--profile", help="save cProfile stats of all rounds")
+    args = parser.parse_args(argv)
+
+    server = site.serve()
+    profile = cProfile.Profile() if args.profile else None
+
+    try:
+        if profile:
+            profile.enable()
+
+        results = navigate(server.url, args.rounds, args.trace)
+
+    finally:
+        if profile:
+            profile.disable()
+
+        server.shutdown()
+
+    report(results)
+
+    if profile:
+        profile.dump_stats(args.profile)
+        pstats.Stats(args.profile).sort_stats("cumulative").print_stats(20)
+
+    if failed := [x.name for steps in results for x in steps if x.items <= 0]:
+        print(f"directory is not shown: {failed}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
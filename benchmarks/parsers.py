@@ -0,0 +1,87 @@
+"""Parser and directory building benchmarks.
+
+Usage: python -m benchmarks.parsers [-k FILTER] [--save]"""
+
+from typing import Callable, Iterator
+
+from bs4 import SoupStrainer, Tag
+
+from resources.lib import addon
+from resources.lib.zophar import parsers
+from resources.lib.zophar.parsers import soup
+from resources.lib.zophar.parsers.gamelistpage import parse_gamelistpage
+from resources.lib.zophar.parsers.gamepage import parse_gamepage
+from resources.lib.zophar.parsers.infopage import parse_infopage
+
+from .harness import Benchmarks, fixture, main
+
+PAGES = (
+    "gamelist",
+    "gamelist_page1",
+    "gamepage",
+    "infopage",
+    "search_empty",
+    "search_results",
+)
+
+_STRAINER = SoupStrainer("div", id=["gamelistpage", "gamepage", "infopage"])
+_CHUNK_SIZE = 16 * 1024
+
+
+def _on(backend: str, func: Callable[[], object]) -> Callable[[], object]:
+    def _run() -> object:
+        soup.set_backend(backend)
+        return func()
+
+    return _run
+
+
+def _page_tag(name: str) -> Tag:
+    return soup.make_soup(fixture(name), _STRAINER).contents[0]  # type: ignore
+
+
+def _chunks(html: str) -> Iterator[str]:
+    return (html[n : n + _CHUNK_SIZE] for n in range(0, len(html), _CHUNK_SIZE))
+
+
+def benchmarks() -> Benchmarks:
+    result: Benchmarks = {}
+
+    for backend in soup.BACKENDS:
+        for name in PAGES:
+            html = fixture(name)
+            func = _on(backend, lambda html=html: parsers.parse_page(html))
+            result[f"parse_page[{name},{backend}]"] = func
+
+        html = fixture("searchpage")
+        func = _on(backend, lambda html=html: parsers.parse_searchpage(html))
+        result[f"parse_searchpage[{backend}]"] = func
+
+    # Page parsers only, tree is built once.
+    gamelist, gamepage = _page_tag("gamelist_page1"), _page_tag("gamepage")
+    infopage = _page_tag("infopage")
+    result["parse_gamelistpage"] = lambda: parse_gamelistpage(gamelist)
+    result["parse_gamepage"] = lambda: parse_gamepage(gamepage)
+    result["parse_infopage"] = lambda: parse_infopage(infopage)
+
+    html = fixture("gamelist_page1")
+    result["stream_page[gamelist_page1]"] = lambda: list(
+        parsers.stream_page(_chunks(html)).entries  # type: ignore
+    )
+
+    # Directory items of whole view.
+    menu, _ = parsers.parse_searchpage(fixture("searchpage"))
+    entries = parsers.parse_page(html).entries  # type: ignore
+    info = parsers.parse_page(fixture("infopage")).entries  # type: ignore
+    result["menuitem_args"] = lambda: [addon.menuitem_args(x) for x in menu]
+    result["submenuitem_args"] = lambda: [
+        addon.submenuitem_args(x, True) for x in menu["Consoles"]
+    ]
+    result["infopageitem_args"] = lambda: list(map(addon.infopageitem_args, info))
+    result["gamelistitem_args"] = lambda: list(map(addon.gamelistitem_args, entries))
+
+    return result
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(benchmarks()))
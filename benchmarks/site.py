@@ -0,0 +1,76 @@
+"""Offline site: HTML fixtures of `tests` served by `MockServer`.
+
+All game entries of gamelist fixture lead to gamepage fixture. Cover
+images are on other host, so covers are disabled by `SETTINGS`."""
+
+import tempfile
+from typing import Dict, Final, Optional, Tuple
+from urllib.parse import urlencode
+
+import requests
+
+from resources.lib.zophar import parsers
+from resources.lib.zophar.replay import MockServer, Recordings
+
+from .harness import fixture
+
+INFOPAGE: Final = "/music/developers"
+GAMELIST: Final = "/music/virtual-boy"
+GAMEPAGE: Final = "/music/virtual-boy/galaxy-rescue-1"
+
+SETTINGS: Final = {"covers": "false"}
+"""Addon settings of offline navigation"""
+
+NAVIGATION: Final = (
+    ("root", ""),
+    ("submenu", urlencode({"menu": "Consoles"})),
+    ("infopage", urlencode({"path": INFOPAGE, "submenu": "Developers"})),
+    ("gamelist", urlencode({"path": GAMELIST, "submenu": "Virtual Boy"})),
+    ("gamepage", urlencode({"path": GAMEPAGE})),
+)
+"""Navigation steps: name and plugin query"""
+
+PLUGIN_URL: Final = "plugin://plugin.audio.zophar/"
+
+
+def plugin_argv(query: str) -> Tuple[str, str, str]:
+    """Plugin invocation arguments (see `addon.run`)."""
+
+    return PLUGIN_URL, "1", f"?{query}"
+
+
+def routes() -> Dict[str, str]:
+    """Fixture names by request path."""
+
+    result = {"/music/search": "searchpage", INFOPAGE: "infopage"}
+    result[GAMELIST] = "gamelist"
+    gamelist = parsers.parse_page(fixture("gamelist"))
+    assert isinstance(gamelist, parsers.GameListPage)
+
+    for x in gamelist.entries:
+        result[x.path] = "gamepage"
+
+    return result
+
+
+def record(directory: str) -> None:
+    """Writes fixtures as recorded responses."""
+
+    recordings = Recordings(directory)
+
+    for path, name in routes().items():
+        response = requests.Response()
+        response.status_code, response.url = 200, path
+        response.headers["Content-Type"] = "text/html; charset=utf-8"
+        response._content = fixture(name).encode()
+        recordings.save(path, response)
+
+
+def serve(directory: Optional[str] = None) -> MockServer:
+    """Starts mock server of fixtures in background."""
+
+    directory = directory or tempfile.mkdtemp(prefix="zophar-site-")
+    record(directory)
+    server = MockServer(directory)
+    server.start()
+    return server
@@ -0,0 +1,32 @@
+"""Page snapshot benchmarks: load of binary snapshot against parsing.
+
+Usage: python -m benchmarks.snapshot [-k FILTER] [--save]"""
+
+from resources.lib.zophar import parsers
+from resources.lib.zophar.snapshot import dumps_page, loads_page
+
+from .harness import Benchmarks, fixture, main
+from .parsers import PAGES
+
+
+def benchmarks() -> Benchmarks:
+    result: Benchmarks = {}
+
+    for name in PAGES:
+        html = fixture(name)
+        data = dumps_page(page := parsers.parse_page(html))
+        result[f"parse_page[{name}]"] = lambda html=html: parsers.parse_page(html)
+        result[f"dumps_page[{name}]"] = lambda page=page: dumps_page(page)
+        result[f"loads_page[{name}]"] = lambda data=data: loads_page(data)
+
+        # Gamelist entries are decoded on access: full iteration is fair.
+        if isinstance(page, parsers.GameListPage):
+            result[f"loads_page[{name},entries]"] = lambda data=data: list(
+                loads_page(data).entries  # type: ignore
+            )
+
+    return result
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(benchmarks()))
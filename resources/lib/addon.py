@@ -1,14 +1,49 @@
+from __future__ import annotations
+
+import os
 import sys
-from typing import Final, Iterator, Optional, Tuple, Union, cast
-from urllib.parse import parse_qs, urlencode
+import threading
+import time
+from itertools import chain, islice
+from typing import (
+    Dict,
+    Final,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+from urllib.parse import parse_qs, urlencode, urljoin
 
 import xbmc
-import xbmcaddon
 import xbmcgui
 import xbmcplugin
 import xbmcvfs
 
 from resources.lib import zophar
+from resources.lib.common import (
+    ADDON,
+    ADDON_ID,
+    ADDON_PATH,
+    CATALOG_DB,
+    COVERS_PATH,
+    PROFILE_PATH,
+    PROXY_PROPERTY,
+    home,
+    log,
+    open_albums,
+    open_cache,
+    open_catalog,
+    open_covers,
+    open_metadata,
+    refresh_home_expired,
+    setup,
+)
+from resources.lib.profiling import Profiler
 
 LOCALIZED_IDS: Final = {
     "Consoles": 30000,
@@ -41,11 +76,33 @@ MONTHS_CODES: Final = (
 
 ItemArgs = Tuple[str, xbmcgui.ListItem, bool]
 
-BASE_URL: Final = sys.argv[0]
-PLUGIN_HANDLE: Final = int(sys.argv[1])
-ARGS: Final = parse_qs(sys.argv[2][1:])
-ADDON: Final = xbmcaddon.Addon()
-ADDON_PATH: Final = xbmcvfs.translatePath(ADDON.getAddonInfo("path"))
+NAVIGATION_PROPERTY: Final = f"{ADDON_ID}.navigation"
+PREFETCH_ENTRIES: Final = 10
+PREFETCH_BUDGET: Final = 2 * 1024 * 1024
+COVERS_BUDGET: Final = 4 * 1024 * 1024
+GAMELIST_PAGE_SIZE: Final = 200
+GAMELIST_BATCH: Final = 50
+
+# Invocation arguments are set by `run`, so module is importable outside
+# of plugin invocation.
+BASE_URL = ""
+PLUGIN_HANDLE = -1
+QUERY = ""
+ARGS: Dict[str, List[str]] = {}
+NAVIGATION_ID = ""
+
+PREFETCH: List[Tuple[str, Dict[str, str]]] = []
+"""Pages fetched to cache after directory is displayed"""
+
+COVERS: Optional[zophar.CoverCache] = None
+"""Cover art cache (if enabled)"""
+
+METADATA: Optional[zophar.MetadataCache] = None
+"""Game metadata cache (if enrichment is enabled)"""
+
+TIMINGS_PATH: Final = os.path.join(PROFILE_PATH, "timings.json")
+PLAYLIST_STATE: Final = os.path.join(PROFILE_PATH, "playlist.json")
+PLAYLISTS_PATH: Final = xbmcvfs.translatePath("special://profile/playlists/music")
 
 
 def build_url(**params: str) -> str:
@@ -89,17 +146,47 @@ def date_normalize(value: str) -> str:
     return "-".join(result)
 
 
+def cover_art(url: str) -> str:
+    # Image not cached yet is shown by remote URL. It is downloaded in
+    # background, and local copy is used on next views.
+    return COVERS and COVERS.get(url) or url
+
+
 def menuitem_args(label: str) -> ItemArgs:
     return build_url(menu=label), xbmcgui.ListItem(i18n(label)), True
 
 
-def submenuitem_args(item: zophar.Browsable) -> ItemArgs:
+def playlist_menu(item: xbmcgui.ListItem, path: str, name: str) -> None:
+    url = build_url(action="build_playlist", path=path, name=name)
+    item.addContextMenuItems([(i18n(30305), f"RunPlugin({url})")])
+
+
+def submenuitem_args(item: zophar.Browsable, playlist: bool = False) -> ItemArgs:
     name, path = item.name, item.path
-    return build_url(path=path, submenu=name), xbmcgui.ListItem(i18n(name)), True
+    listitem = xbmcgui.ListItem(i18n(name))
+
+    if playlist:
+        playlist_menu(listitem, path, name)
+
+    return build_url(path=path, submenu=name), listitem, True
 
 
 def infopageitem_args(item: zophar.Browsable) -> ItemArgs:
-    return build_url(path=item.path), xbmcgui.ListItem(item.name), True
+    listitem = xbmcgui.ListItem(item.name)
+    playlist_menu(listitem, item.path, item.name)
+    return build_url(path=item.path), listitem, True
+
+
+def gameinfo_comment(x: zophar.GameInfo) -> str:
+    lines = [i18n(30303).format(x.tracks)]
+
+    if x.publisher:
+        lines.append(i18n(30304).format(x.publisher))
+
+    if x.flac:
+        lines.append(zophar.AudioFormat.FLAC.name)
+
+    return "\n".join(lines)
 
 
 def gamelistitem_args(game: zophar.GameEntry) -> ItemArgs:
@@ -121,17 +208,37 @@ def gamelistitem_args(game: zophar.GameEntry) -> ItemArgs:
         info.setArtist(developer)
 
     if cover := game.cover:
-        item.setArt({"thumb": cover})
+        item.setArt({"thumb": cover_art(cover)})
+
+    # Missing metadata is resolved after directory is displayed.
+    if METADATA and (x := METADATA.get(game.path)):
+        info.setDuration(x.duration)
+        info.setComment(gameinfo_comment(x))
+
+    download = build_url(action="download_album", path=game.path)
+    item.addContextMenuItems([(i18n(30301), f"RunPlugin({download})")])
 
     return build_url(path=game.path), item, True
 
 
-def add_gamelist(gamelist: zophar.GameListPage) -> None:
-    items = list(map(gamelistitem_args, gamelist.entries))
-    xbmcplugin.addDirectoryItems(PLUGIN_HANDLE, items)
+def add_gamelist(
+    entries: Iterable[zophar.GameEntry], title: str, total: int = 0
+) -> None:
+    # Items are added by batches while entries are fetched and parsed.
+    # `total` is expected number of items shown by loading progress.
+    entries = iter(entries)
+    batches = iter(lambda: list(islice(entries, GAMELIST_BATCH)), [])
+
+    for n, batch in enumerate(batches):
+        if n == 0:
+            PREFETCH.extend((x.path, {}) for x in batch[:PREFETCH_ENTRIES])
+
+        items = list(map(gamelistitem_args, batch))
+        xbmcplugin.addDirectoryItems(PLUGIN_HANDLE, items, total)
+
     xbmcplugin.addSortMethod(PLUGIN_HANDLE, xbmcplugin.SORT_METHOD_LABEL)
     xbmcplugin.setContent(PLUGIN_HANDLE, "albums")
-    xbmcplugin.setPluginCategory(PLUGIN_HANDLE, i18n(gamelist.title))
+    xbmcplugin.setPluginCategory(PLUGIN_HANDLE, i18n(title))
 
 
 def build_menu(menu_items: zophar.Menu):
@@ -144,7 +251,9 @@ def build_menu(menu_items: zophar.Menu):
 
 
 def build_submenu(menu_items: zophar.Menu, menu: str):
-    items = list(map(submenuitem_args, menu_items[menu]))
+    # Only 'Info' submenu has entries that are not gamelists.
+    playlist = menu != "Info"
+    items = [submenuitem_args(x, playlist) for x in menu_items[menu]]
     xbmcplugin.addDirectoryItems(PLUGIN_HANDLE, items)
     xbmcplugin.addSortMethod(PLUGIN_HANDLE, xbmcplugin.SORT_METHOD_NONE)
     xbmcplugin.setContent(PLUGIN_HANDLE, "files")
@@ -160,11 +269,32 @@ def build_infopage(page: zophar.InfoPage):
     xbmcplugin.setPluginCategory(PLUGIN_HANDLE, i18n(cast(str, arg("submenu"))))
 
 
-def build_gamelist(gamelist: zophar.GameListPage, path: str):
-    add_gamelist(gamelist)
+def add_nextpage(
+    gamelist: Union[zophar.GameListPage, zophar.GameListStream], path: str
+) -> None:
+    if (n := gamelist.page + 1) > (total := gamelist.total_pages):
+        return
+
+    PREFETCH.append((path, {"page": str(n)}))
+    item = xbmcgui.ListItem(i18n(30300).format(n, total))
+    item.setProperty("SpecialSort", "bottom")
+    url = build_url(path=path, page=str(n))
+    xbmcplugin.addDirectoryItem(PLUGIN_HANDLE, url, item, True)
 
-    if (n := gamelist.page) < gamelist.total_pages:
-        build_gamelist(zophar.gamelist(path, n + 1), path)
+
+def build_gamelist(
+    gamelist: Union[zophar.GameListPage, zophar.GameListStream], path: str
+):
+    if ADDON.getSettings().getBool("paginate"):
+        add_gamelist(gamelist.entries, gamelist.title, GAMELIST_PAGE_SIZE)
+        return add_nextpage(gamelist, path)
+
+    # First page already knows total number of pages. Rest are fetched
+    # concurrently and merged in page order.
+    rest = range(gamelist.page + 1, gamelist.total_pages + 1)
+    pages = chain([gamelist], zophar.gamelists(path, rest))
+    entries = chain.from_iterable(x.entries for x in pages)
+    add_gamelist(entries, gamelist.title, GAMELIST_PAGE_SIZE * (len(rest) + 1))
 
 
 def get_audioformat(game: zophar.GamePage) -> zophar.AudioFormat:
@@ -173,15 +303,30 @@ def get_audioformat(game: zophar.GamePage) -> zophar.AudioFormat:
     return zophar.AudioFormat.MP3
 
 
-def build_gamepage(game: zophar.GamePage):
+def build_gamepage(game: zophar.GamePage, path: str):
     album, developer, cover = game.name, game.developer, game.cover
+
+    if METADATA:
+        METADATA.put(path, zophar.game_info(game))
+
+    cover = cover and cover_art(cover)
     mimetype = (format := get_audioformat(game)).mime
+    urls = [x.url(format) for x in game.tracks]
+
+    # Downloaded album is preferred if it matches playlist. Else remote
+    # streams are played through read-ahead proxy if service runs it.
+    if (files := open_albums().tracks(path, format)) and len(files) == len(urls):
+        urls = files
+
+    elif port := xbmcgui.Window(10000).getProperty(PROXY_PROPERTY):
+        next = urls[1:] + [None]
+        urls = [zophar.proxy_url(int(port), *x) for x in zip(urls, next)]
 
     if release_date := game.release_date:
         release_date = date_normalize(release_date)
 
     def _tracks() -> Iterator[ItemArgs]:
-        for num, track in enumerate(game.tracks, 1):
+        for num, (track, url) in enumerate(zip(game.tracks, urls), 1):
             item = xbmcgui.ListItem(track.title)
             info: xbmc.InfoTagMusic = item.getMusicInfoTag()
 
@@ -192,7 +337,7 @@ def build_gamepage(game: zophar.GamePage):
             info.setDuration(track.length.seconds)
             info.setGenres(["Soundtrack"])
             info.setMediaType("song")
-            info.setURL(url := track.url(format))
+            info.setURL(url)
             info.setAlbum(album)
 
             if developer:
@@ -212,10 +357,106 @@ def build_gamepage(game: zophar.GamePage):
     xbmcplugin.setPluginCategory(PLUGIN_HANDLE, album)
 
 
+def build_page(path: str, **params: str):
+    if ADDON.getSettings().getBool("stream"):
+        page = zophar.page_stream(path, **params)
+    else:
+        page = zophar.page(path, **params)
+
+    if isinstance(page, zophar.GamePage):
+        build_gamepage(page, path)
+
+    elif isinstance(page, zophar.InfoPage):
+        build_infopage(page)
+
+    else:
+        build_gamelist(page, path)
+
+
+BUILDERS: Final = (
+    "build_menu",
+    "build_submenu",
+    "build_infopage",
+    "build_gamelist",
+    "build_gamepage",
+)
+
+
+def update_catalog() -> None:
+    xbmcvfs.mkdirs(PROFILE_PATH)
+    monitor, dialog = xbmc.Monitor(), xbmcgui.DialogProgressBG()
+    dialog.create(ADDON.getAddonInfo("name"), i18n(30132))
+
+    def _progress(done: int, total: int) -> bool:
+        dialog.update(done * 100 // total)
+        return not monitor.abortRequested()
+
+    try:
+        zophar.crawl(zophar.Catalog(CATALOG_DB), home()[0], _progress)
+
+    finally:
+        dialog.close()
+
+
+def download_album(path: str) -> None:
+    game = zophar.page(path)
+    assert isinstance(game, zophar.GamePage)
+    format = get_audioformat(game)
+    url = urljoin(zophar.browser.BASE_URL, game.archives[format])
+    monitor, dialog = xbmc.Monitor(), xbmcgui.DialogProgressBG()
+    dialog.create(game.name, i18n(30301))
+
+    def _progress(done: int, total: int) -> bool:
+        dialog.update(done * 100 // total if total else 0)
+        return not monitor.abortRequested()
+
+    try:
+        if open_albums().download(path, url, format, _progress):
+            xbmcgui.Dialog().notification(game.name, i18n(30302))
+
+    finally:
+        dialog.close()
+
+
+def build_playlist(path: str, name: str) -> None:
+    settings = ADDON.getSettings()
+    format = zophar.AudioFormat.MP3
+
+    if settings.getBool("flac"):
+        format = zophar.AudioFormat.FLAC
+
+    xbmcvfs.mkdirs(PLAYLISTS_PATH)
+    file = os.path.join(PLAYLISTS_PATH, name.replace("/", "-") + ".m3u")
+    file = xbmcvfs.makeLegalFilename(file)
+    monitor, dialog = xbmc.Monitor(), xbmcgui.DialogProgressBG()
+    dialog.create(name, i18n(30305))
+
+    def _progress(done: int, total: int) -> bool:
+        dialog.update(done * 100 // total)
+        return not monitor.abortRequested()
+
+    try:
+        if zophar.build_playlist(path, file, PLAYLIST_STATE, format, _progress):
+            xbmcgui.Dialog().notification(name, i18n(30306))
+
+    finally:
+        dialog.close()
+
+
 class SearchDialog(xbmcgui.WindowXMLDialog):
+    MIN_CHARS: Final = 3
+    """Minimal length of search string"""
+    DEBOUNCE: Final = 0.3
+    """Live search starts when text is not changed for this time (seconds)"""
+
     def __init__(self, *args, **kwargs) -> None:
-        self.platforms = kwargs.pop("platforms")
+        self.platform_ids = kwargs.pop("platforms")
+        self.platforms = list(self.platform_ids)
         self.setProperty("platform", self.platforms[0])
+        self.results: Dict[Tuple[str, str], zophar.GameListPage] = {}
+        # Local index is used if it is enabled and not empty.
+        self.catalog = open_catalog() or None
+        self.stopped = threading.Event()
         super().__init__(*args, **kwargs)
 
     def select_platform(self) -> None:
@@ -226,9 +467,16 @@ class SearchDialog(xbmcgui.WindowXMLDialog):
     def text(self) -> str:
         return cast(xbmcgui.ControlEdit, self.getControl(100)).getText()
 
+    @property
+    def query(self) -> Tuple[str, str]:
+        return self.getProperty("platform"), self.text
+
+    def onInit(self) -> None:
+        threading.Thread(target=self.live_search, daemon=True).start()
+
     def onClick(self, control_id: int) -> None:
         if control_id == 100:  # edit control
-            return self.getControl(102).setEnabled(len(self.text) >= 3)
+            return self.getControl(102).setEnabled(len(self.text) >= self.MIN_CHARS)
 
         if control_id == 101:  # select platform button
             return self.select_platform()
@@ -237,6 +485,78 @@ class SearchDialog(xbmcgui.WindowXMLDialog):
             self.setProperty("context", self.text)
             return self.close()
 
+        if control_id == 103:  # live results list
+            control = cast(xbmcgui.ControlList, self.getControl(103))
+
+            if item := control.getSelectedItem():
+                self.setProperty("path", item.getProperty("path"))
+                return self.close()
+
+    def cached_prefix(self, platform: str, text: str) -> Optional[zophar.GameListPage]:
+        for n in range(len(text) - 1, self.MIN_CHARS - 1, -1):
+            if (result := self.results.get((platform, text[:n]))) is not None:
+                return result
+
+    def lookup(self, platform: str, text: str) -> zophar.GameListPage:
+        if (result := self.results.get((platform, text))) is not None:
+            return result
+
+        result = None
+
+        if self.catalog:
+            entries = self.catalog.search(text, platform)
+            result = zophar.GameListPage(entries, i18n(283), "", 1, 1)
+
+        # Site search matches substrings, so results of any cached prefix
+        # contain all results of longer text. Site may match by other
+        # fields than name, so empty filtered result is queried again.
+        elif (prefix := self.cached_prefix(platform, text)) is not None:
+            entries = [x for x in prefix.entries if text.lower() in x.name.lower()]
+            result = zophar.GameListPage(entries, prefix.title, "", 1, 1) or None
+
+        if result is None:
+            result = zophar.search(text, self.platform_ids[platform])
+
+        self.results[platform, text] = result
+        return result
+
+    def live_search(self) -> None:
+        # Polls edit control. Query is started only if it is not changed
+        # during debounce interval, and its results are shown only if it
+        # is still actual.
+        pending, shown = None, None
+
+        while not self.stopped.wait(self.DEBOUNCE):
+            if (query := self.query) != pending:
+                pending = query
+                continue
+
+            if query == shown or len(query[1]) < self.MIN_CHARS:
+                continue
+
+            try:
+                entries = self.lookup(*query).entries
+
+            except Exception as e:
+                log(f"Live search failed: {e}", xbmc.LOGWARNING)
+                continue
+
+            if query == self.query:
+                shown = query
+                self.show(entries)
+
+    def show(self, entries: List[zophar.GameEntry]) -> None:
+        items = []
+
+        for game in entries:
+            item = gamelistitem_args(game)[1]
+            item.setProperty("path", game.path)
+            items.append(item)
+
+        control = cast(xbmcgui.ControlList, self.getControl(103))
+        control.reset()
+        control.addItems(items)
+
     @classmethod
     def run(cls, platforms: zophar.Platforms) -> bool:
         dialog = cls(
@@ -244,16 +564,21 @@ class SearchDialog(xbmcgui.WindowXMLDialog):
             ADDON_PATH,
             "default",
             "1080i",
-            platforms=list(platforms),
+            platforms=platforms,
         )
 
         dialog.doModal()
+        dialog.stopped.set()
+
+        if path := dialog.getProperty("path"):
+            build_page(path)
+            return True
 
         if context := dialog.getProperty("context"):
-            platform = platforms[dialog.getProperty("platform")]
+            platform = dialog.getProperty("platform")
 
-            if result := zophar.search(context, platform):
-                add_gamelist(result)
+            if result := dialog.lookup(platform, context):
+                add_gamelist(result.entries, result.title)
                 return True
 
             xbmcgui.Dialog().ok(i18n(283), i18n(284))  # not found dialog
@@ -261,30 +586,123 @@ class SearchDialog(xbmcgui.WindowXMLDialog):
         return False
 
 
-def run() -> None:
-    if path := arg("path"):
-        page = zophar.page(path)
+def start_profiler() -> Profiler:
+    profiler = Profiler()
+    profiler.instrument(zophar.browser, "fetch", "get_page")
+    profiler.instrument(zophar.parsers, "parse", "parse_page", "parse_searchpage")
+    profiler.instrument(sys.modules[__name__], "build", *BUILDERS)
+    profiler.instrument(xbmcplugin, "end", "endOfDirectory")
+    return profiler
+
+
+def stop_profiler(profiler: Profiler) -> None:
+    profiler.restore()
+    stats = zophar.get_transport().stats
+    size = sum(x.size for x in stats)
+    status = ",".join(str(x.status) for x in stats) or "-"
+    net = f"net={len(stats)}/{size}B status={status}"
+    log(f"{QUERY or '?'} {profiler.summary()} {net}", xbmc.LOGINFO)
+    xbmcvfs.mkdirs(PROFILE_PATH)
+    profiler.save(TIMINGS_PATH)
 
-        if isinstance(page, zophar.GameListPage):
-            build_gamelist(page, path)
 
-        elif isinstance(page, zophar.GamePage):
-            build_gamepage(page)
+def navigated_away() -> bool:
+    # Background work is cancelled when user navigates away: other
+    # invocation replaces navigation mark of home window.
+    if xbmc.Monitor().abortRequested():
+        return True
 
-        elif isinstance(page, zophar.InfoPage):
-            build_infopage(page)
+    return xbmcgui.Window(10000).getProperty(NAVIGATION_PROPERTY) != NAVIGATION_ID
+
+
+def prefetch() -> None:
+    zophar.prefetch(PREFETCH, PREFETCH_BUDGET, navigated_away)
+
+
+def navigate() -> bool:
+    """Builds directory. Returns `False` if nothing is displayed."""
+
+    xbmcgui.Window(10000).setProperty(NAVIGATION_PROPERTY, NAVIGATION_ID)
+
+    if path := arg("path"):
+        params = {"page": x} if (x := arg("page")) else {}
+        build_page(path, **params)
 
     else:
-        menu_items, platforms = zophar.home()
+        menu_items, platforms = home()
 
         if menu := arg("menu"):
             if menu != "Search":
                 build_submenu(menu_items, menu)
 
             elif not SearchDialog.run(platforms):
-                return
+                return False
 
         else:
             build_menu(menu_items)
 
     xbmcplugin.endOfDirectory(PLUGIN_HANDLE)
+    return True
+
+
+def background() -> None:
+    """Work after directory is displayed: update expired menus snapshot or
+    warm up cache for probable next navigation."""
+
+    if not arg("path"):
+        refresh_home_expired()
+
+    elif PREFETCH and ADDON.getSettings().getBool("prefetch"):
+        prefetch()
+
+    if COVERS and COVERS.missing:
+        COVERS.fetch(budget=COVERS_BUDGET, cancelled=navigated_away)
+
+    # Enriched items are shown on next refresh of directory.
+    if METADATA and METADATA.missing:
+        METADATA.fetch(cancelled=navigated_away)
+
+
+def run(argv: Optional[Sequence[str]] = None) -> None:
+    """Plugin invocation. Arguments are `sys.argv` of plugin by default."""
+
+    global BASE_URL, PLUGIN_HANDLE, QUERY, ARGS, NAVIGATION_ID, COVERS, METADATA
+
+    BASE_URL, handle, QUERY = (argv or sys.argv)[:3]
+    PLUGIN_HANDLE, ARGS = int(handle), parse_qs(QUERY[1:])
+    NAVIGATION_ID = f"{os.getpid()}.{time.time()}"
+    PREFETCH.clear()
+
+    if arg("action") == "clear_cache":
+        open_cache().clear()
+        zophar.CoverCache(COVERS_PATH, 0).clear()
+        return xbmcgui.Dialog().notification(ADDON.getAddonInfo("name"), i18n(30104))
+
+    setup()
+    COVERS = open_covers()
+    METADATA = open_metadata()
+
+    if (action := arg("action")) == "update_catalog":
+        return update_catalog()
+
+    if action == "download_album":
+        return download_album(cast(str, arg("path")))
+
+    if action == "build_playlist":
+        return build_playlist(cast(str, arg("path")), cast(str, arg("name")))
+
+    if not ADDON.getSettings().getBool("profiling"):
+        shown = navigate()
+
+    else:
+        profiler = start_profiler()
+
+        # Background work is not profiled: it does not delay directory.
+        try:
+            shown = navigate()
+
+        finally:
+            stop_profiler(profiler)
+
+    if shown:
+        background()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import os
+from typing import Final, Optional, Tuple
+
+import xbmc
+import xbmcaddon
+import xbmcvfs
+
+from resources.lib import zophar
+
+ADDON: Final = xbmcaddon.Addon()
+ADDON_ID: Final = ADDON.getAddonInfo("id")
+ADDON_PATH: Final = xbmcvfs.translatePath(ADDON.getAddonInfo("path"))
+PROFILE_PATH: Final = xbmcvfs.translatePath(ADDON.getAddonInfo("profile"))
+CACHE_DB: Final = os.path.join(PROFILE_PATH, "cache.db")
+COVERS_PATH: Final = os.path.join(PROFILE_PATH, "covers")
+PROXY_PROPERTY: Final = f"{ADDON_ID}.proxy"
+"""Home window property with port of stream proxy run by service"""
+ALBUMS_PATH: Final = os.path.join(PROFILE_PATH, "albums")
+CATALOG_DB: Final = os.path.join(PROFILE_PATH, "catalog.db")
+RECORDINGS_PATH: Final = os.path.join(PROFILE_PATH, "recordings")
+METADATA_DB: Final = os.path.join(PROFILE_PATH, "metadata.db")
+RATE_LIMIT_DB: Final = os.path.join(PROFILE_PATH, "ratelimit.db")
+"""Request rate limit state shared by plugin invocations and service"""
+HOME_SNAPSHOT: Final = os.path.join(PROFILE_PATH, "searchpage.bin")
+HOME_SNAPSHOT_DEFAULT: Final = os.path.join(ADDON_PATH, "resources", "searchpage.bin")
+
+
+def log(message: str, level: int = xbmc.LOGDEBUG) -> None:
+    xbmc.log(f"[{ADDON_ID}] {message}", level)
+
+
+def open_cache() -> zophar.PageCache:
+    xbmcvfs.mkdirs(PROFILE_PATH)
+    size = ADDON.getSettings().getInt("cache_size")
+    return zophar.PageCache(CACHE_DB, size * 1024 * 1024)
+
+
+def open_covers() -> Optional[zophar.CoverCache]:
+    if (settings := ADDON.getSettings()).getBool("covers"):
+        size = settings.getInt("covers_size")
+        return zophar.CoverCache(COVERS_PATH, size * 1024 * 1024)
+
+
+def open_metadata() -> Optional[zophar.MetadataCache]:
+    if ADDON.getSettings().getBool("enrich"):
+        xbmcvfs.mkdirs(PROFILE_PATH)
+        return zophar.MetadataCache(METADATA_DB)
+
+
+def open_albums() -> zophar.AlbumStore:
+    size = ADDON.getSettings().getInt("albums_size")
+    return zophar.AlbumStore(ALBUMS_PATH, size * 1024 * 1024)
+
+
+def open_catalog() -> Optional[zophar.Catalog]:
+    if ADDON.getSettings().getBool("catalog") and os.path.exists(CATALOG_DB):
+        return zophar.Catalog(CATALOG_DB)
+
+
+def refresh_home() -> Tuple[zophar.Menu, zophar.Platforms]:
+    xbmcvfs.mkdirs(PROFILE_PATH)
+    menu_items, platforms = zophar.home()
+    zophar.dump_searchpage(HOME_SNAPSHOT, menu_items, platforms)
+    return menu_items, platforms
+
+
+def home() -> Tuple[zophar.Menu, zophar.Platforms]:
+    # Menus are almost static. Load them from profile snapshot or default
+    # snapshot bundled with addon (if packaged). Download search page only
+    # as last resort.
+    for path in (HOME_SNAPSHOT, HOME_SNAPSHOT_DEFAULT):
+        if result := zophar.load_searchpage(path):
+            return result
+
+    return refresh_home()
+
+
+def refresh_home_expired() -> None:
+    if zophar.snapshot_age(HOME_SNAPSHOT) < zophar.browser.CACHE_TTL["searchpage"]:
+        return
+
+    try:
+        refresh_home()
+
+    except Exception as e:
+        log(f"Menu refresh failed: {e}", xbmc.LOGWARNING)
+
+
+def setup_transport() -> None:
+    settings = ADDON.getSettings()
+    connect_timeout = settings.getInt("connect_timeout")
+    read_timeout = settings.getInt("read_timeout")
+    xbmcvfs.mkdirs(PROFILE_PATH)
+    limiter = zophar.RateLimiter(RATE_LIMIT_DB, settings.getInt("rate_limit"))
+    options = {
+        "connect_timeout": connect_timeout,
+        "read_timeout": read_timeout,
+        "limiter": limiter,
+    }
+
+    # Recorded responses may be replayed by `zophar.MockServer` offline.
+    if settings.getBool("record"):
+        transport = zophar.RecordingTransport(RECORDINGS_PATH, **options)
+        return zophar.set_transport(transport)
+
+    # Transport is created on first request only.
+    zophar.set_transport(**options)
+
+
+def setup() -> None:
+    setup_transport()
+
+    if ADDON.getSettings().getBool("cache"):
+        zophar.set_cache(open_cache())
@@ -0,0 +1,92 @@
+import json
+import os
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Final, List, Sequence, Tuple
+
+WINDOW: Final = 200
+"""Number of samples per stage kept in statistics file"""
+
+PERCENTILES: Final = (50, 90, 99)
+
+
+def _percentile(samples: Sequence[float], p: int) -> float:
+    x = sorted(samples)
+    return x[min(len(x) - 1, len(x) * p // 100)]
+
+
+class Profiler:
+    """Wall time profiler of plugin invocation stages.
+
+    Functions are instrumented by replacing module attributes with timed
+    wrappers until `restore`, so disabled profiling has no overhead at all."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._originals: List[Tuple[Any, str, Callable]] = []
+
+    def add(self, stage: str, elapsed: float) -> None:
+        with self._lock:
+            self.stages.setdefault(stage, []).append(elapsed)
+
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+
+            try:
+                return func(*args, **kwargs)
+
+            finally:
+                self.add(stage, time.perf_counter() - start)
+
+        return wrapper
+
+    def instrument(self, module: Any, stage: str, *names: str) -> None:
+        """Replaces module functions with timed wrappers."""
+
+        for name in names:
+            self._originals.append((module, name, func := getattr(module, name)))
+            setattr(module, name, self.wrap(stage, func))
+
+    def restore(self) -> None:
+        """Restores instrumented functions."""
+
+        for module, name, func in reversed(self._originals):
+            setattr(module, name, func)
+
+        self._originals.clear()
+
+    def summary(self) -> str:
+        """Compact one-line summary: total time and time of each stage."""
+
+        total = time.perf_counter() - self._start
+        result = [f"total={total:.3f}s"]
+
+        for stage, x in self.stages.items():
+            result.append(f"{stage}={sum(x):.3f}s/{len(x)}")
+
+        return " ".join(result)
+
+    def save(self, path: str) -> None:
+        """Appends stage timings to statistics file with rolling percentiles."""
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+
+        except (OSError, ValueError):
+            data = {}
+
+        for stage, x in self.stages.items():
+            samples = (data.get(stage, {}).get("samples", []) + [sum(x)])[-WINDOW:]
+            data[stage] = {f"p{p}": _percentile(samples, p) for p in PERCENTILES}
+            data[stage]["samples"] = samples
+
+        with open(tmp := path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+
+        os.replace(tmp, path)
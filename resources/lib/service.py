@@ -0,0 +1,156 @@
+import os
+import threading
+import time
+from typing import Final, Iterator, Optional
+
+import xbmc
+import xbmcaddon
+import xbmcgui
+import xbmcvfs
+
+from resources.lib import zophar
+from resources.lib.common import (
+    ADDON,
+    CATALOG_DB,
+    PROFILE_PATH,
+    PROXY_PROPERTY,
+    home,
+    log,
+    open_catalog,
+    refresh_home_expired,
+    setup,
+)
+
+POLL_INTERVAL: Final = 60
+"""Interval between schedule checks (seconds)"""
+IDLE_TIME: Final = 60
+"""Updates are started only after this time of user inactivity (seconds)"""
+RECENT_YEARS: Final = 2
+"""Number of recent years with warmed gamelists"""
+LAST_UPDATE: Final = os.path.join(PROFILE_PATH, "service.last")
+"""Modification time of this file is time of last update"""
+
+
+def hot_lists(menu: zophar.Menu) -> Iterator[str]:
+    """Paths of Top 100 and recent years gamelists."""
+
+    items = {x.name: x for section in menu.values() for x in section}
+
+    if top := items.get("Top 100 Games"):
+        yield top.path
+
+    if years := items.get("Music by Year"):
+        page = zophar.page(years.path)
+        assert isinstance(page, zophar.InfoPage)
+        recent = sorted(page.entries, key=lambda x: x.name, reverse=True)
+
+        for x in recent[:RECENT_YEARS]:
+            yield x.path
+
+
+def update(budget: int) -> None:
+    """Refreshes menus, hot gamelists and catalog within traffic budget."""
+
+    monitor = xbmc.Monitor()
+    setup()
+
+    def _proceed(*_) -> bool:
+        if monitor.abortRequested():
+            return False
+
+        return sum(x.size for x in zophar.get_transport().stats) < budget
+
+    refresh_home_expired()
+    menu = home()[0]
+
+    # Expired pages are revalidated by page cache. Plugin invocations are
+    # served first.
+    with zophar.priority(zophar.Priority.PREFETCH):
+        for path in hot_lists(menu):
+            if not _proceed():
+                return
+
+            # Same requests as plugin does, so pages are cached with same keys.
+            first = zophar.page(path)
+            assert isinstance(first, zophar.GameListPage)
+
+            for _ in zophar.gamelists(path, range(2, first.total_pages + 1)):
+                pass
+
+    if open_catalog() is not None and _proceed():
+        zophar.crawl(zophar.Catalog(CATALOG_DB), menu, _proceed)
+
+
+def last_update() -> float:
+    try:
+        return os.path.getmtime(LAST_UPDATE)
+
+    except OSError:
+        return 0
+
+
+def is_due(settings: xbmcaddon.Settings) -> bool:
+    if not settings.getBool("service"):
+        return False
+
+    if time.time() - last_update() < settings.getInt("service_interval") * 60 * 60:
+        return False
+
+    # Update only while user is idle and nothing is playing.
+    return xbmc.getGlobalIdleTime() >= IDLE_TIME and not xbmc.Player().isPlaying()
+
+
+def start_proxy() -> Optional[zophar.StreamProxy]:
+    if not ADDON.getSettings().getBool("proxy"):
+        return None
+
+    # Fixed port keeps URLs of listed items valid after service restart.
+    try:
+        proxy = zophar.StreamProxy(ADDON.getSettings().getInt("proxy_port"))
+
+    except OSError as e:
+        log(f"Proxy port is not available: {e}", xbmc.LOGWARNING)
+        proxy = zophar.StreamProxy()
+
+    threading.Thread(target=proxy.serve_forever, daemon=True).start()
+    xbmcgui.Window(10000).setProperty(PROXY_PROPERTY, str(proxy.server_port))
+    return proxy
+
+
+def stop_proxy(proxy: Optional[zophar.StreamProxy]) -> None:
+    if proxy:
+        xbmcgui.Window(10000).clearProperty(PROXY_PROPERTY)
+        proxy.shutdown()
+        proxy.server_close()
+
+
+def run() -> None:
+    monitor = xbmc.Monitor()
+    setup()
+    proxy = start_proxy()
+
+    try:
+        schedule(monitor)
+
+    finally:
+        stop_proxy(proxy)
+
+
+def schedule(monitor: xbmc.Monitor) -> None:
+    while not monitor.waitForAbort(POLL_INTERVAL):
+        # Settings may be changed while service is running.
+        if not is_due(settings := xbmcaddon.Addon().getSettings()):
+            continue
+
+        log("Background update started", xbmc.LOGINFO)
+
+        try:
+            update(settings.getInt("service_budget") * 1024 * 1024)
+
+        except Exception as e:
+            log(f"Background update failed: {e}", xbmc.LOGWARNING)
+
+        xbmcvfs.mkdirs(PROFILE_PATH)
+
+        with open(LAST_UPDATE, "w"):
+            pass
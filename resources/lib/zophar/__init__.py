@@ -1,30 +1,171 @@
-from .browser import gamelist, home, page, search
-from .parsers import (
-    AudioFormat,
-    AudioTrack,
-    Browsable,
-    GameEntry,
-    GameListPage,
-    GamePage,
-    InfoPage,
-    Menu,
-    ParseError,
-    Platforms,
-)
+import importlib
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:
+    from .albums import AlbumStore, ArchiveError
+    from .browser import (
+        gamelist,
+        gamelists,
+        get_transport,
+        home,
+        page,
+        page_stream,
+        prefetch,
+        search,
+        set_base_url,
+        set_cache,
+        set_transport,
+        transient_page,
+    )
+    from .cache import PageCache
+    from .catalog import Catalog, crawl
+    from .covers import CoverCache
+    from .metadata import GameInfo, MetadataCache, game_info
+    from .parsers import (
+        AudioFormat,
+        AudioTrack,
+        Browsable,
+        GameEntry,
+        GameListPage,
+        GameListStream,
+        GamePage,
+        InfoPage,
+        Menu,
+        ParseError,
+        Platforms,
+    )
+    from .playlist import build_playlist
+    from .proxy import StreamProxy
+    from .replay import MockServer, RecordingTransport, ReplayTransport
+    from .scheduler import Priority, RateLimiter, priority
+    from .snapshot import (
+        SnapshotError,
+        dump_searchpage,
+        dumps_page,
+        load_searchpage,
+        loads_page,
+        snapshot_age,
+    )
+    from .transport import RequestStats, Transport
+    from .urls import proxy_url
+
+# Submodules are imported on first access (PEP 562): plugin invocation
+# served from cache never imports network and HTML parsing stacks.
+_LAZY: Final = {
+    "AlbumStore": ".albums",
+    "ArchiveError": ".albums",
+    "AudioFormat": ".parsers",
+    "AudioTrack": ".parsers",
+    "Browsable": ".parsers",
+    "build_playlist": ".playlist",
+    "Catalog": ".catalog",
+    "CoverCache": ".covers",
+    "crawl": ".catalog",
+    "dump_searchpage": ".snapshot",
+    "dumps_page": ".snapshot",
+    "game_info": ".metadata",
+    "GameEntry": ".parsers",
+    "GameInfo": ".metadata",
+    "gamelist": ".browser",
+    "GameListPage": ".parsers",
+    "gamelists": ".browser",
+    "GameListStream": ".parsers",
+    "GamePage": ".parsers",
+    "get_transport": ".browser",
+    "home": ".browser",
+    "InfoPage": ".parsers",
+    "load_searchpage": ".snapshot",
+    "loads_page": ".snapshot",
+    "Menu": ".parsers",
+    "MetadataCache": ".metadata",
+    "MockServer": ".replay",
+    "page": ".browser",
+    "page_stream": ".browser",
+    "PageCache": ".cache",
+    "ParseError": ".parsers",
+    "Platforms": ".parsers",
+    "prefetch": ".browser",
+    "Priority": ".scheduler",
+    "priority": ".scheduler",
+    "RateLimiter": ".scheduler",
+    "proxy_url": ".urls",
+    "RecordingTransport": ".replay",
+    "ReplayTransport": ".replay",
+    "RequestStats": ".transport",
+    "search": ".browser",
+    "set_base_url": ".browser",
+    "set_cache": ".browser",
+    "set_transport": ".browser",
+    "snapshot_age": ".snapshot",
+    "SnapshotError": ".snapshot",
+    "StreamProxy": ".proxy",
+    "transient_page": ".browser",
+    "Transport": ".transport",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if (module := _LAZY.get(name)) is not None:
+        x = getattr(importlib.import_module(module, __name__), name)
+
+    elif f".{name}" in _LAZY.values():
+        x = importlib.import_module(f".{name}", __name__)  # submodule
+
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = x
+    return x
+
 
 __all__ = [
+    "AlbumStore",
+    "ArchiveError",
     "AudioFormat",
     "AudioTrack",
     "Browsable",
+    "build_playlist",
+    "Catalog",
+    "CoverCache",
+    "crawl",
+    "dump_searchpage",
+    "dumps_page",
+    "game_info",
     "GameEntry",
+    "GameInfo",
     "gamelist",
     "GameListPage",
+    "gamelists",
+    "GameListStream",
     "GamePage",
+    "get_transport",
     "home",
     "InfoPage",
+    "load_searchpage",
+    "loads_page",
     "Menu",
+    "MetadataCache",
+    "MockServer",
     "page",
+    "page_stream",
+    "PageCache",
     "ParseError",
     "Platforms",
+    "prefetch",
+    "Priority",
+    "priority",
+    "proxy_url",
+    "RateLimiter",
+    "RecordingTransport",
+    "ReplayTransport",
+    "RequestStats",
     "search",
+    "set_base_url",
+    "set_cache",
+    "set_transport",
+    "snapshot_age",
+    "SnapshotError",
+    "StreamProxy",
+    "transient_page",
+    "Transport",
 ]
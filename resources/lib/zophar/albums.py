@@ -0,0 +1,232 @@
+import hashlib
+import json
+import os
+import posixpath
+import struct
+import zlib
+from contextlib import nullcontext
+from typing import Callable, Final, Iterator, List, Optional
+
+from .browser import get_transport
+from .parsers import AudioFormat
+
+_LOCAL_HEADER: Final = struct.Struct("<4sHHHHHIIIHH")
+_LOCAL_SIGNATURE: Final = b"PK\x03\x04"
+_DESCRIPTOR_SIGNATURE: Final = b"PK\x07\x08"
+_STORED, _DEFLATED = 0, 8
+_HAS_DESCRIPTOR: Final = 0x08
+
+_CHUNK_SIZE: Final = 64 * 1024
+_STATE: Final = "state.json"
+_COMPLETE: Final = "complete"
+
+
+class ArchiveError(Exception):
+    """Unsupported or broken archive"""
+
+
+class _Stream:
+    """Reader of chunked response body with pushback and offset tracking."""
+
+    def __init__(self, chunks: Iterator[bytes], offset: int) -> None:
+        self.offset = offset
+        self._chunks = chunks
+        self._buffer = b""
+
+    def chunk(self) -> bytes:
+        if x := self._buffer:
+            self._buffer = b""
+        else:
+            x = next(self._chunks, b"")
+
+        self.offset += len(x)
+        return x
+
+    def unread(self, data: bytes) -> None:
+        self._buffer = data + self._buffer
+        self.offset -= len(data)
+
+    def read(self, size: int) -> bytes:
+        result = b""
+
+        while len(result) < size and (x := self.chunk()):
+            result += x
+
+        self.unread(result[size:])
+
+        if len(result) < size:
+            raise ArchiveError("Unexpected end of archive")
+
+        return result[:size]
+
+
+def _copy_stored(stream: _Stream, size: int, write: Callable[[bytes], object]):
+    while size:
+        write(x := stream.read(min(size, _CHUNK_SIZE)))
+        size -= len(x)
+
+
+def _copy_deflated(stream: _Stream, write: Callable[[bytes], object]) -> None:
+    # Compressed size may be unknown (data descriptor), so decompressor
+    # itself detects end of entry data.
+    z = zlib.decompressobj(-zlib.MAX_WBITS)
+
+    while not z.eof:
+        if not (x := stream.chunk()):
+            raise ArchiveError("Unexpected end of archive")
+
+        write(z.decompress(x))
+
+    stream.unread(z.unused_data)
+
+
+def _skip_descriptor(stream: _Stream) -> None:
+    x = stream.read(4)
+    # Signature is optional. Sizes may be 64-bit, but not in our archives.
+    stream.read(12 if x == _DESCRIPTOR_SIGNATURE else 8)
+
+
+class AlbumStore:
+    """Downloaded albums by audio format with LRU eviction by disk quota.
+
+    Archives are extracted while downloading and never stored in full.
+    Interrupted download resumes from the first not extracted entry."""
+
+    def __init__(self, directory: str, max_size: int) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        """Disk quota of each audio format"""
+
+    def _dir(self, path: str, format: AudioFormat) -> str:
+        name = hashlib.sha1(path.encode()).hexdigest()
+        return os.path.join(self.directory, format.value, name)
+
+    def tracks(self, path: str, format: AudioFormat) -> Optional[List[str]]:
+        """Local audio files of downloaded album sorted by name."""
+
+        try:
+            with open(x := os.path.join(self._dir(path, format), _COMPLETE)) as f:
+                files = json.load(f)
+
+            os.utime(x)  # mark as recently used
+
+        except (OSError, ValueError):
+            return None
+
+        return [os.path.join(os.path.dirname(x), name) for name in files]
+
+    def download(
+        self,
+        path: str,
+        url: str,
+        format: AudioFormat,
+        progress: Optional[Callable[[int, int], bool]] = None,
+    ) -> bool:
+        """Downloads and extracts album archive. Returns `False` if aborted.
+
+        `progress(done, total)` is called with downloaded bytes. Download
+        is aborted if it returns `False`."""
+
+        os.makedirs(dir := self._dir(path, format), exist_ok=True)
+        state_path = os.path.join(dir, _STATE)
+
+        try:
+            with open(state_path) as f:
+                state = json.load(f)
+
+        except (OSError, ValueError):
+            state = {"offset": 0, "files": []}
+
+        headers = {"Range": f"bytes={x}-"} if (x := state["offset"]) else None
+
+        with get_transport().stream(url, headers) as response:
+            response.raise_for_status()
+
+            if response.status_code != 206:
+                state = {"offset": 0, "files": []}  # range is not supported
+
+            total = state["offset"] + int(response.headers.get("Content-Length", 0))
+            chunks = response.iter_content(_CHUNK_SIZE)
+            stream = _Stream(chunks, state["offset"])
+
+            while (header := stream.read(4)) == _LOCAL_SIGNATURE:
+                stream.unread(header)
+                self._extract(stream, dir, format, state["files"])
+                state["offset"] = stream.offset
+
+                with open(state_path, "w") as f:
+                    json.dump(state, f)
+
+                if progress and progress(stream.offset, total) is False:
+                    return False
+
+        with open(os.path.join(dir, _COMPLETE), "w") as f:
+            json.dump(sorted(state["files"]), f)
+
+        os.remove(state_path)
+        self.evict(format)
+        return True
+
+    def _extract(
+        self, stream: _Stream, dir: str, format: AudioFormat, files: List[str]
+    ) -> None:
+        x = _LOCAL_HEADER.unpack(stream.read(_LOCAL_HEADER.size))
+        _, _, flags, method, _, _, _, size, _, name_len, extra_len = x
+        name = stream.read(name_len).decode("utf-8", "replace")
+        stream.read(extra_len)
+
+        # Only audio files of requested format are extracted. Path is
+        # flattened to prevent writing outside album directory.
+        name = posixpath.basename(name.replace("\\", "/"))
+        extract = name.lower().endswith(f".{format.value}")
+
+        tmp = os.path.join(dir, ".partial")
+
+        with open(tmp, "wb") if extract else nullcontext() as f:
+            write = f.write if f else len
+
+            if method == _DEFLATED:
+                _copy_deflated(stream, write)
+
+            elif method == _STORED and not flags & _HAS_DESCRIPTOR:
+                _copy_stored(stream, size, write)
+
+            else:
+                raise ArchiveError(f"Unsupported compression method: {method}")
+
+        if flags & _HAS_DESCRIPTOR:
+            _skip_descriptor(stream)
+
+        if extract:
+            os.replace(tmp, os.path.join(dir, name))
+
+            if name not in files:
+                files.append(name)
+
+    def evict(self, format: AudioFormat) -> None:
+        """Removes least recently used albums over disk quota."""
+
+        albums = []
+
+        for x in os.scandir(os.path.join(self.directory, format.value)):
+            try:
+                mtime = os.path.getmtime(os.path.join(x.path, _COMPLETE))
+
+            except OSError:
+                continue  # incomplete
+
+            size = sum(y.stat().st_size for y in os.scandir(x.path))
+            albums.append((mtime, size, x.path))
+
+        total = sum(x[1] for x in albums)
+
+        for _, size, path in sorted(albums):
+            if total <= self.max_size:
+                break
+
+            total -= size
+
+            for x in os.scandir(path):
+                os.remove(x.path)
+
+            os.rmdir(path)
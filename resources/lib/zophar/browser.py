@@ -1,35 +1,375 @@
-import requests
+from __future__ import annotations
 
-from .parsers import GameListPage, PagesSupported, parse_page, parse_searchpage
+import codecs
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import chain
+from threading import Event, Lock
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Final,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
+from urllib.parse import urlencode
+
+from . import parsers
+from .cache import PageCache
+from .parsers import GameListPage, PagesSupported
+from .scheduler import Priority, RateLimiter, inherit_priority, priority
+from .snapshot import SnapshotError, dumps_page, loads_page
+
+if TYPE_CHECKING:
+    import requests
+
+    from .parsers import GameListStream
+    from .transport import Transport
 
 BASE_URL = "https://www.zophar.net"
 SEARCH_PATH = "/music/search"
+MAX_WORKERS = 4
+PREFETCH_WORKERS = 2
+
+_CHUNK_SIZE: Final = 16 * 1024
+_FLIGHT_POLL: Final = 0.1
+_HOUR: Final = 60 * 60
+_DAY: Final = 24 * _HOUR
+
+# Time to live of cached pages by page type. Search page menus and game pages
+# are almost static, game lists are updated by new releases.
+CACHE_TTL: Final = {
+    "searchpage": 7 * _DAY,
+    "gamelistpage": _DAY,
+    "gamepage": 30 * _DAY,
+    "infopage": 7 * _DAY,
+}
+
+FLIGHT_TTL: Final = 60
+"""Page fetched by other process is waited for this number of seconds at most"""
+
+_cache: Optional[PageCache] = None
+_transport: Optional[Transport] = None
+_transport_options: Dict[str, Any] = {}
+_transport_lock = Lock()
+
+
+class _Flight:
+    """Page fetched by one thread for all concurrent callers"""
+
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result: Optional[PagesSupported] = None
+        self.error: Optional[Exception] = None
+
+
+_flights: Dict[str, _Flight] = {}
+_flights_lock = Lock()
+
+
+def set_base_url(url: str) -> None:
+    """Sets site URL. Local mock server may be used instead of real site."""
+
+    global BASE_URL
+    BASE_URL = url
+
+
+def set_cache(cache: Optional[PageCache]) -> None:
+    """Sets persistent page cache. `None` disables caching."""
+
+    global _cache
+    _cache = cache
+
+
+def set_transport(transport: Optional[Transport] = None, **options: Any) -> None:
+    """Sets shared HTTP transport used by all requests. If `transport` is
+    not set, default one is created with `options` on first request.
+    Requests of default transport are rate limited within process unless
+    other `limiter` is set (see `RateLimiter`)."""
+
+    global _transport, _transport_options
+    _transport, _transport_options = transport, options
+
+
+def get_transport() -> Transport:
+    global _transport
+
+    # Network stack is imported only when it is needed.
+    with _transport_lock:
+        if _transport is None:
+            from .transport import Transport
+
+            options = {"pool_size": MAX_WORKERS, **_transport_options}
+            options.setdefault("limiter", RateLimiter())
+            _transport = Transport(**options)
+
+        return _transport
+
+
+def _cache_key(path: str, params: Dict[str, str]) -> str:
+    if params:
+        return f"{path}?{urlencode(sorted(params.items()))}"
+
+    return path
+
+
+def _cache_ttl(path: str, params: Dict[str, str], html: str) -> float:
+    if path == SEARCH_PATH and not params:
+        return CACHE_TTL["searchpage"]
+
+    for id in ("gamelistpage", "gamepage", "infopage"):
+        if f'id="{id}"' in html:
+            return CACHE_TTL[id]
+
+    return 0
 
 
 def get_page(path: str, **params: str) -> str:
-    return requests.get(BASE_URL + path, params).text
+    if _cache is None:
+        return get_transport().get(BASE_URL + path, params).text
+
+    key, headers = _cache_key(path, params), {}
+
+    if entry := _cache.get(key):
+        if entry.fresh:
+            return entry.body
+
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+    response = get_transport().get(BASE_URL + path, params, headers)
+
+    if entry and response.status_code == 304:
+        _cache.touch(key, _cache_ttl(path, params, entry.body))
+        return entry.body
+
+    _store(path, params, response, html := response.text)
+    return html
+
+
+def _store(
+    path: str, params: Dict[str, str], response: requests.Response, html: str
+) -> None:
+    # Redirected responses (like random game) must not be cached.
+    if _cache is None or not response.ok or response.history:
+        return
+
+    if ttl := _cache_ttl(path, params, html):
+        etag = response.headers.get("ETag")
+        modified = response.headers.get("Last-Modified")
+        _cache.put(_cache_key(path, params), html, ttl, etag, modified)
+
+
+def _iter_text(response: requests.Response) -> Iterator[str]:
+    # Same charset as of `Response.text` if it is known from headers.
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")("replace")
+
+    with response:
+        for x in response.iter_content(_CHUNK_SIZE):
+            if text := decoder.decode(x):
+                yield text
+
+        if text := decoder.decode(b"", final=True):
+            yield text
+
+
+def prefetch(
+    pages: Iterable[Tuple[str, Dict[str, str]]],
+    budget: int,
+    cancelled: Callable[[], bool],
+) -> None:
+    """Fetches and parses pages to cache in background until byte `budget`
+    is exhausted or `cancelled()` returns `True`. Fresh cached pages are
+    skipped."""
+
+    if _cache is None:
+        return
+
+    lock, left = Lock(), budget
+
+    def _fetch(item: Tuple[str, Dict[str, str]]) -> None:
+        nonlocal left
+        path, params = item
+
+        if left <= 0 or cancelled():
+            return
+
+        if (x := _cache.get(key := _cache_key(path, params))) and x.fresh:
+            if x.parsed:
+                return
+
+        try:
+            # Snapshot is stored too: prefetched page is shown without parsing.
+            with priority(Priority.PREFETCH):
+                page(path, **params)
+
+        except Exception:
+            return  # prefetch is optional
+
+        if x := _cache.get(key):
+            with lock:
+                left -= len(x.body)
+
+    with ThreadPoolExecutor(PREFETCH_WORKERS) as pool:
+        for _ in pool.map(_fetch, pages):
+            pass
 
 
 def home():
     html = get_page(SEARCH_PATH)
-    return parse_searchpage(html)
+    return parsers.parse_searchpage(html)
+
+
+def _cached_page(key: str) -> Optional[PagesSupported]:
+    # Fresh cached pages are loaded from snapshot without HTML parsing.
+    if _cache is not None and (x := _cache.get(key)):
+        if x.fresh and x.parsed:
+            try:
+                return loads_page(x.parsed)
+
+            except SnapshotError:
+                pass  # written by other version
+
+    return None
+
+
+def _wait_flight(key: str) -> Optional[PagesSupported]:
+    """Waits for page fetched by other process. `None` if it is not cached."""
+
+    assert _cache is not None
+
+    while _cache.in_flight(key):
+        time.sleep(_FLIGHT_POLL)
+
+    return _cached_page(key)
+
+
+def _fetch_page(key: str, path: str, params: Dict[str, str]) -> PagesSupported:
+    claimed = _cache is not None and _cache.claim(key, FLIGHT_TTL)
+
+    # Page fetched by other process is taken from cache. It is fetched
+    # again only if it was not cached (error or redirect).
+    if _cache is not None and not claimed:
+        if (x := _wait_flight(key)) is not None:
+            return x
+
+    try:
+        result = parsers.parse_page(get_page(path, **params))
+
+        if _cache is not None:
+            _cache.put_parsed(key, dumps_page(result))
+
+        return result
+
+    finally:
+        if claimed:
+            _cache.release(key)  # type: ignore
 
 
 def page(path: str, **params: str) -> PagesSupported:
-    html = get_page(path, **params)
-    return parse_page(html)
+    """Fetches and parses page. Concurrent calls for same page in threads
+    and processes share one request."""
+
+    if (x := _cached_page(key := _cache_key(path, params))) is not None:
+        return x
+
+    with _flights_lock:
+        if is_leader := (flight := _flights.get(key)) is None:
+            flight = _flights[key] = _Flight()
 
+    if not is_leader:
+        flight.done.wait()
 
-def gamelist(path: str, page_num: int) -> GameListPage:
-    html = get_page(path, page=str(page_num))
-    page = parse_page(html)
-    assert isinstance(page, GameListPage)
-    return page
+        if flight.error is not None:
+            raise flight.error
+
+        return cast(PagesSupported, flight.result)
+
+    try:
+        flight.result = _fetch_page(key, path, params)
+        return flight.result
+
+    except Exception as e:
+        flight.error = e
+        raise
+
+    finally:
+        with _flights_lock:
+            del _flights[key]
+
+        flight.done.set()
+
+
+def transient_page(path: str, **params: str) -> PagesSupported:
+    """Same as `page`, but fetched page is not stored to cache. Background
+    jobs use it not to evict pages of user navigation."""
+
+    if (x := _cached_page(_cache_key(path, params))) is not None:
+        return x
+
+    return parsers.parse_page(get_transport().get(BASE_URL + path, params).text)
+
+
+def page_stream(path: str, **params: str) -> Union[GameListStream, PagesSupported]:
+    """Same as `page`, but gamelist page is parsed while it is downloaded.
+
+    Only pages missing in cache and not fetched by other caller are
+    streamed. Stale ones are revalidated."""
+
+    key = _cache_key(path, params)
+    known = _cache is not None and (_cache.get(key) or _cache.in_flight(key))
+
+    if known or key in _flights:
+        return page(path, **params)
+
+    response = get_transport().get(BASE_URL + path, params, stream=True)
+    on_complete = partial(_store, path, params, response) if _cache else None
+    return parsers.stream_page(_iter_text(response), on_complete)
+
+
+def gamelist(
+    path: str, page_num: int, transient: bool = False, **params: str
+) -> GameListPage:
+    """Fetches gamelist page. `transient` page is not stored to cache."""
+
+    fetch = transient_page if transient else page
+    result = fetch(path, page=str(page_num), **params)
+    assert isinstance(result, GameListPage)
+    return result
+
+
+def gamelists(
+    path: str, page_nums: Iterable[int], transient: bool = False, **params: str
+) -> Iterator[GameListPage]:
+    """Fetches gamelist pages concurrently with priority of calling thread.
+    Yields pages in requested order."""
+
+    fetch = partial(gamelist, path, transient=transient, **params)
+
+    with ThreadPoolExecutor(MAX_WORKERS) as pool:
+        yield from pool.map(inherit_priority(fetch), page_nums)
 
 
 def search(context: str, console: str) -> GameListPage:
-    html = get_page(SEARCH_PATH, search=context, search_consoleid=console)
-    page = parse_page(html)
-    assert isinstance(page, GameListPage)
-    assert page.total_pages == 1
-    return page
+    """Searches games. Results of all pages are merged to one page."""
+
+    params = {"search": context, "search_consoleid": console}
+    result = page(SEARCH_PATH, **params)
+    assert isinstance(result, GameListPage)
+
+    if (total := result.total_pages) > 1:
+        rest = gamelists(SEARCH_PATH, range(2, total + 1), **params)
+        entries = list(chain(result.entries, *(x.entries for x in rest)))
+        result = GameListPage(entries, result.title, result.description, 1, 1)
+
+    return result
@@ -0,0 +1,187 @@
+import sqlite3
+import threading
+import time
+from typing import Final, NamedTuple, Optional
+
+_SCHEMA: Final = """
+CREATE TABLE IF NOT EXISTS pages (
+    key TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS flights (
+    key TEXT PRIMARY KEY,
+    expires REAL NOT NULL
+);
+"""
+
+ACCESS_RESOLUTION: Final = 60 * 60
+"""Access time of entry is updated only if it is older (seconds)"""
+
+_INSERT: Final = """
+INSERT OR REPLACE INTO pages(key, body, size, etag, last_modified, expires, accessed)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class CacheEntry(NamedTuple):
+    """Cached response body with revalidation data"""
+
+    body: str
+    """Response text"""
+    etag: Optional[str]
+    """Value of `ETag` response header"""
+    last_modified: Optional[str]
+    """Value of `Last-Modified` response header"""
+    expires: float
+    """Expiration UNIX timestamp"""
+    parsed: Optional[bytes]
+    """Snapshot of parsed page"""
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires
+
+
+class PageCache:
+    """Persistent SQLite-backed HTTP response cache with LRU eviction."""
+
+    def __init__(self, path: str, max_size: int) -> None:
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        # Write ahead log does not sync on each commit and lets readers of
+        # other processes proceed while page is stored.
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        self._db.executescript(_SCHEMA)
+
+        try:
+            self._db.execute("ALTER TABLE pages ADD COLUMN parsed BLOB")
+
+        except sqlite3.OperationalError:
+            pass  # already added
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Returns cached entry (even expired) or `None`."""
+
+        now = time.time()
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, expires, parsed, accessed "
+                "FROM pages WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            # LRU order needs coarse access time only. Most hits are reads.
+            if now - row[-1] > ACCESS_RESOLUTION:
+                with self._db:
+                    self._db.execute(
+                        "UPDATE pages SET accessed = ? WHERE key = ?", (now, key)
+                    )
+
+        return CacheEntry(*row[:-1])
+
+    def put(
+        self,
+        key: str,
+        body: str,
+        ttl: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Stores response and evicts least recently used entries over size cap."""
+
+        now, size = time.time(), len(body.encode())
+
+        with self._lock, self._db:
+            self._db.execute(
+                _INSERT,
+                (key, body, size, etag, last_modified, now + ttl, now),
+            )
+            self._evict()
+
+    def put_parsed(self, key: str, data: bytes) -> None:
+        """Attaches snapshot of parsed page to stored response."""
+
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE pages SET parsed = ?, size = size + ? "
+                "WHERE key = ? AND parsed IS NULL",
+                (data, len(data), key),
+            )
+            self._evict()
+
+    def touch(self, key: str, ttl: float) -> None:
+        """Renews expiration of revalidated entry."""
+
+        now = time.time()
+
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE pages SET expires = ?, accessed = ? WHERE key = ?",
+                (now + ttl, now, key),
+            )
+
+    def claim(self, key: str, ttl: float) -> bool:
+        """Marks request in flight for `ttl` seconds. Returns `False` if it
+        is already fetched by other process."""
+
+        now = time.time()
+
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM flights WHERE key = ? AND expires < ?", (key, now)
+            )
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO flights VALUES (?, ?)", (key, now + ttl)
+            )
+
+        return cursor.rowcount == 1
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT expires FROM flights WHERE key = ?", (key,)
+            ).fetchone()
+
+        return row is not None and time.time() < row[0]
+
+    def release(self, key: str) -> None:
+        """Removes in flight mark of completed request."""
+
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM flights WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Removes all entries."""
+
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM pages")
+
+        self._db.execute("VACUUM")
+
+    def _evict(self) -> None:
+        total = self._db.execute("SELECT TOTAL(size) FROM pages").fetchone()[0]
+
+        if total <= self._max_size:
+            return
+
+        rows = self._db.execute("SELECT key, size FROM pages ORDER BY accessed")
+        evicted = []
+
+        for key, size in rows:
+            evicted.append((key,))
+
+            if (total := total - size) <= self._max_size:
+                break
+
+        self._db.executemany("DELETE FROM pages WHERE key = ?", evicted)
@@ -0,0 +1,211 @@
+import difflib
+import sqlite3
+import threading
+import time
+from typing import Callable, Final, Iterable, List, Optional
+
+from .browser import gamelist, gamelists
+from .parsers import GameEntry, Menu
+from .scheduler import Priority, priority
+
+_SCHEMA: Final = """
+CREATE TABLE IF NOT EXISTS games (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    cover TEXT,
+    year TEXT,
+    console TEXT,
+    developer TEXT
+);
+CREATE TABLE IF NOT EXISTS lists (
+    path TEXT PRIMARY KEY,
+    updated REAL NOT NULL
+);
+"""
+
+_FTS_SCHEMA: Final = """
+CREATE VIRTUAL TABLE IF NOT EXISTS games_fts USING fts5(
+    name, content='games', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS games_ai AFTER INSERT ON games BEGIN
+    INSERT INTO games_fts(rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS games_ad AFTER DELETE ON games BEGIN
+    INSERT INTO games_fts(games_fts, rowid, name)
+    VALUES ('delete', old.rowid, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS games_au AFTER UPDATE ON games BEGIN
+    INSERT INTO games_fts(games_fts, rowid, name)
+    VALUES ('delete', old.rowid, old.name);
+    INSERT INTO games_fts(rowid, name) VALUES (new.rowid, new.name);
+END;
+"""
+
+_COLUMNS: Final = "path, name, cover, year, console, developer"
+
+# Upsert never replaces known fields by missing ones: letter lists have
+# no console column, but console lists do.
+_UPSERT: Final = f"""
+INSERT INTO games({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(path) DO UPDATE SET
+    name = excluded.name,
+    cover = COALESCE(excluded.cover, cover),
+    year = COALESCE(excluded.year, year),
+    console = COALESCE(excluded.console, console),
+    developer = COALESCE(excluded.developer, developer)
+"""
+
+PLATFORM_SECTIONS: Final = ("Consoles", "Computers")
+"""Root menu sections with gamelists of each platform"""
+
+CATALOG_SECTIONS: Final = (*PLATFORM_SECTIONS, "Music By Letter")
+"""Root menu sections with gamelists crawled to catalog"""
+
+LIST_TTL: Final = 7 * 24 * 60 * 60
+"""Gamelist is crawled again after this number of seconds"""
+
+MAX_RESULTS: Final = 200
+"""Search results limit (same as one gamelist page)"""
+
+
+def _entry(row) -> GameEntry:
+    path, name, cover, year, console, developer = row
+
+    return GameEntry(
+        name=name,
+        path=path,
+        cover=cover,
+        year=year,
+        console=console,
+        developer=developer,
+    )
+
+
+def _match_query(text: str) -> str:
+    # Each word is prefix-matched. Quotes are escaped by doubling.
+    words = (x.replace('"', '""') for x in text.split())
+    return " ".join(f'"{x}"*' for x in words)
+
+
+class Catalog:
+    """Local SQLite index of all game entries with full-text search."""
+
+    def __init__(self, path: str) -> None:
+        self._lock = threading.Lock()
+        self._consoles: Optional[List[str]] = None
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+        try:
+            self._db.executescript(_FTS_SCHEMA)
+            self.fts = True
+
+        except sqlite3.OperationalError:
+            self.fts = False  # SQLite built without FTS5
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def update(self, entries: Iterable[GameEntry], console: Optional[str] = None):
+        """Inserts or updates entries. `console` is used if entry has no one."""
+
+        rows = [
+            (x.path, x.name, x.cover, x.year, x.console or console, x.developer)
+            for x in entries
+        ]
+
+        with self._lock, self._db:
+            self._db.executemany(_UPSERT, rows)
+            self._consoles = None
+
+    def consoles(self) -> List[str]:
+        """Known consoles. Computed once until catalog is updated."""
+
+        with self._lock:
+            if self._consoles is None:
+                rows = self._db.execute("SELECT DISTINCT console FROM games")
+                self._consoles = [x for (x,) in rows if x]
+
+            return self._consoles
+
+    def search(self, text: str, console: Optional[str] = None) -> List[GameEntry]:
+        """Prefix search by all words of `text`. Falls back to fuzzy matching."""
+
+        # Filter is ignored for 'all platforms' and unknown platforms.
+        by_console = [console] if console in self.consoles() else []
+        where = " AND console = ?" if by_console else ""
+
+        if self.fts and (query := _match_query(text)):
+            sql = f"SELECT {_COLUMNS} FROM games WHERE rowid IN "
+            sql += "(SELECT rowid FROM games_fts WHERE games_fts MATCH ?)"
+            args = [query]
+
+        else:
+            words = text.split()
+            sql = f"SELECT {_COLUMNS} FROM games WHERE 1"
+            sql += " AND name LIKE ?" * len(words)
+            args = [f"%{x}%" for x in words]
+
+        sql += f"{where} ORDER BY name LIMIT {MAX_RESULTS}"
+
+        with self._lock:
+            rows = self._db.execute(sql, args + by_console)
+
+            if result := [_entry(x) for x in rows]:
+                return result
+
+            sql = f"SELECT {_COLUMNS} FROM games WHERE 1{where}"
+            rows = {x[1].lower(): x for x in self._db.execute(sql, by_console)}
+
+        names = difflib.get_close_matches(text.lower(), rows, MAX_RESULTS, 0.6)
+        return [_entry(rows[x]) for x in names]
+
+    def is_outdated(self, path: str) -> bool:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT updated FROM lists WHERE path = ?", (path,)
+            ).fetchone()
+
+        return row is None or time.time() - row[0] > LIST_TTL
+
+    def set_updated(self, path: str) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO lists VALUES (?, ?)", (path, time.time())
+            )
+
+
+def crawl(
+    catalog: Catalog,
+    menu: Menu,
+    progress: Optional[Callable[[int, int], bool]] = None,
+) -> None:
+    """Incrementally crawls outdated gamelists of menu sections to catalog.
+
+    `progress(done, total)` is called after each list. Crawling is
+    aborted if it returns `False`. Requests have lowest priority and
+    crawled pages are not stored to page cache of user navigation."""
+
+    todo = [
+        (x, section in PLATFORM_SECTIONS)
+        for section in CATALOG_SECTIONS
+        for x in menu.get(section, [])
+        if catalog.is_outdated(x.path)
+    ]
+
+    with priority(Priority.CRAWL):
+        for n, (item, is_platform) in enumerate(todo, 1):
+            first = gamelist(item.path, 1, transient=True)
+            pages = range(2, first.total_pages + 1)
+            rest = gamelists(item.path, pages, transient=True)
+            # Platform lists may have no console column.
+            console = item.name if is_platform else None
+
+            for page in (first, *rest):
+                catalog.update(page.entries, console)
+
+            catalog.set_updated(item.path)
+
+            if progress and progress(n, len(todo)) is False:
+                return
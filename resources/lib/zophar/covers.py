@@ -0,0 +1,110 @@
+import hashlib
+import os
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Dict, Final, Iterable, Optional
+from urllib.parse import urlsplit
+
+from .browser import get_transport
+from .scheduler import Priority, priority
+
+MAX_WORKERS: Final = 4
+
+
+class CoverCache:
+    """Directory of downloaded cover images with LRU eviction by disk quota.
+
+    Access time of each image is tracked by its modification time."""
+
+    def __init__(self, directory: str, max_size: int) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self.missing: Dict[str, None] = {}
+        """URLs requested but not cached yet (ordered set)"""
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        ext = posixpath.splitext(urlsplit(url).path)[1].lower() or ".jpg"
+        name = hashlib.sha1(url.encode()).hexdigest() + ext
+        return os.path.join(self.directory, name)
+
+    def get(self, url: str) -> Optional[str]:
+        """Returns local path to cached image or `None`. Missing image is
+        remembered and is cached by `fetch`."""
+
+        try:
+            os.utime(path := self._path(url))
+
+        except OSError:
+            self.missing[url] = None
+            return None
+
+        return path
+
+    def fetch(
+        self,
+        urls: Optional[Iterable[str]] = None,
+        budget: Optional[int] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """Downloads images (missing by default) in order until byte `budget`
+        is exhausted or `cancelled()` returns `True`. Evicts over quota."""
+
+        urls = list(dict.fromkeys(self.missing if urls is None else urls))
+        self.missing.clear()
+        lock, left = Lock(), budget
+
+        def _download(url: str) -> None:
+            nonlocal left
+
+            if left is not None and left <= 0 or cancelled and cancelled():
+                return
+
+            if os.path.exists(path := self._path(url)):
+                return
+
+            # Network errors (`RequestException`) are `OSError` too.
+            try:
+                with priority(Priority.PREFETCH):
+                    response = get_transport().get(url)
+
+                if not response.ok:
+                    return
+
+                with open(tmp := path + ".tmp", "wb") as f:
+                    f.write(response.content)
+
+                os.replace(tmp, path)
+
+            except OSError:
+                return
+
+            if left is not None:
+                with lock:
+                    left -= len(response.content)
+
+        with ThreadPoolExecutor(MAX_WORKERS) as pool:
+            for _ in pool.map(_download, urls):
+                pass
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes least recently used images over disk quota."""
+
+        files = [x for x in os.scandir(self.directory) if x.is_file()]
+        total = sum(x.stat().st_size for x in files)
+
+        for x in sorted(files, key=lambda x: x.stat().st_mtime):
+            if total <= self.max_size:
+                break
+
+            total -= x.stat().st_size
+            os.remove(x.path)
+
+    def clear(self) -> None:
+        """Removes all images."""
+
+        for x in os.scandir(self.directory):
+            os.remove(x.path)
@@ -0,0 +1,116 @@
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Final, Iterable, NamedTuple, Optional
+
+from .browser import CACHE_TTL, transient_page
+from .parsers import AudioFormat, GamePage
+from .scheduler import Priority, priority
+
+_SCHEMA: Final = """
+CREATE TABLE IF NOT EXISTS games (
+    path TEXT PRIMARY KEY,
+    tracks INTEGER NOT NULL,
+    duration INTEGER NOT NULL,
+    publisher TEXT,
+    flac INTEGER NOT NULL,
+    updated REAL NOT NULL
+)
+"""
+
+MAX_WORKERS: Final = 4
+
+MAX_AGE: Final = CACHE_TTL["gamepage"]
+"""Metadata is resolved again after this number of seconds"""
+
+MAX_MISSING: Final = 50
+"""Number of missing paths remembered for `fetch`: first entries of view"""
+
+
+class GameInfo(NamedTuple):
+    """Game metadata known only from its game page"""
+
+    tracks: int
+    """Number of tracks"""
+    duration: int
+    """Total duration in seconds"""
+    publisher: Optional[str]
+    """Publisher"""
+    flac: bool
+    """FLAC archive is available"""
+
+
+def game_info(game: GamePage) -> GameInfo:
+    return GameInfo(
+        tracks=len(game.tracks),
+        duration=sum(x.seconds for x in game.tracks),
+        publisher=game.publisher,
+        flac=game.has_format(AudioFormat.FLAC),
+    )
+
+
+class MetadataCache:
+    """Persistent SQLite cache of game metadata keyed by game path."""
+
+    def __init__(self, path: str, max_missing: int = MAX_MISSING) -> None:
+        self.max_missing = max_missing
+        self.missing: Dict[str, None] = {}
+        """First paths requested but not cached yet (ordered set)"""
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._db.execute(_SCHEMA)
+
+    def get(self, path: str) -> Optional[GameInfo]:
+        """Returns cached metadata. Remembers missing or outdated path."""
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT tracks, duration, publisher, flac, updated FROM games "
+                "WHERE path = ?",
+                (path,),
+            ).fetchone()
+
+        if row is None or time.time() - row[4] > MAX_AGE:
+            if len(self.missing) < self.max_missing:
+                self.missing[path] = None
+
+        if row is not None:
+            tracks, duration, publisher, flac, _ = row
+            return GameInfo(tracks, duration, publisher, bool(flac))
+
+    def put(self, path: str, info: GameInfo) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?)",
+                (path, *info, time.time()),
+            )
+
+    def fetch(
+        self,
+        paths: Optional[Iterable[str]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """Resolves metadata of games (missing by default) from game pages
+        until `cancelled()` returns `True`. Fetched pages are not cached."""
+
+        paths = list(self.missing if paths is None else paths)
+        self.missing.clear()
+
+        def _resolve(path: str) -> None:
+            if cancelled and cancelled():
+                return
+
+            try:
+                with priority(Priority.PREFETCH):
+                    game = transient_page(path)
+
+            except Exception:
+                return  # enrichment is optional
+
+            if isinstance(game, GamePage):
+                self.put(path, game_info(game))
+
+        with ThreadPoolExecutor(MAX_WORKERS) as pool:
+            for _ in pool.map(_resolve, paths):
+                pass
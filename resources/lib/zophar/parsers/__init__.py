@@ -1,5 +1,6 @@
-from .parser import PagesSupported, parse_page
-from .searchpage import Menu, Platforms, parse_searchpage
+import importlib
+from typing import TYPE_CHECKING, Any, Final
+
 from .types import (
     AudioFormat,
     AudioTrack,
@@ -8,21 +9,55 @@ from .types import (
     GameListPage,
     GamePage,
     InfoPage,
+    Menu,
+    PagesSupported,
     ParseError,
+    Platforms,
 )
 
+if TYPE_CHECKING:
+    from .parser import parse_page
+    from .searchpage import parse_searchpage
+    from .soup import BACKENDS, get_backend, set_backend
+    from .stream import GameListStream, stream_page
+
+# Parsers depend on `bs4` and are imported on first access (PEP 562).
+_LAZY: Final = {
+    "BACKENDS": ".soup",
+    "GameListStream": ".stream",
+    "get_backend": ".soup",
+    "parse_page": ".parser",
+    "parse_searchpage": ".searchpage",
+    "set_backend": ".soup",
+    "stream_page": ".stream",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if (module := _LAZY.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = x = getattr(importlib.import_module(module, __name__), name)
+    return x
+
+
 __all__ = [
     "AudioFormat",
     "AudioTrack",
+    "BACKENDS",
     "Browsable",
-    "Platforms",
     "GameEntry",
     "GameListPage",
+    "GameListStream",
     "GamePage",
+    "get_backend",
     "InfoPage",
     "Menu",
     "PagesSupported",
     "parse_page",
     "parse_searchpage",
     "ParseError",
+    "Platforms",
+    "set_backend",
+    "stream_page",
 ]
@@ -21,16 +21,14 @@ def _tracklist(tracklist: Tag) -> Iterator[AudioTrack]:
         _, name, length, *download = cast(List[Tag], row("td"))
 
         name, length = str(name.string), str(length.string)
-
         m, s = map(int, length.split(":"))
-        length = dt.timedelta(minutes=m, seconds=s)
 
         for x in download:
             url = str(cast(Tag, x.a)["href"])
             fmt = AudioFormat(url.rpartition(".")[2].lower())
 
             if fmt is AudioFormat.MP3:
-                yield AudioTrack(name, length, url)
+                yield AudioTrack(name, dt.timedelta(minutes=m, seconds=s), url)
                 break
 
 
@@ -1,20 +1,19 @@
-from typing import List, Union, cast
+from typing import List, cast
 
-from bs4 import BeautifulSoup, SoupStrainer, Tag
+from bs4 import SoupStrainer, Tag
 
 from .gamelistpage import parse_gamelistpage
 from .gamepage import parse_gamepage
 from .infopage import parse_infopage
-from .types import GameListPage, GamePage, InfoPage, ParseError
-
-PagesSupported = Union[GameListPage, GamePage, InfoPage]
+from .soup import make_soup
+from .types import PagesSupported, ParseError
 
 
 def parse_page(html: str) -> PagesSupported:
     """Parses all supported pages"""
 
     x = SoupStrainer("div", id=["gamelistpage", "gamepage", "infopage"])
-    soup = BeautifulSoup(html, "html.parser", parse_only=x)
+    soup = make_soup(html, x)
 
     if len(contents := cast(List[Tag], soup.contents)) != 1:
         raise ParseError("Unsupported page. May be broken link.")
@@ -1,14 +1,9 @@
-from typing import Dict, Final, List, Mapping, Tuple, cast
+from typing import Dict, Final, List, Tuple, cast
 
-from bs4 import BeautifulSoup, SoupStrainer, Tag
+from bs4 import SoupStrainer, Tag
 
-from .types import Browsable
-
-Platforms = Mapping[str, str]
-"""Mapping between platform name and search id"""
-
-Menu = Mapping[str, List[Browsable]]
-"""Root menu mapping"""
+from .soup import make_soup
+from .types import Browsable, Menu, Platforms
 
 _BLACKLIST: Final = ["Emulated Files"]
 
@@ -44,7 +39,7 @@ def parse_searchpage(html: str) -> Tuple[Menu, Platforms]:
     """Search page parser"""
 
     x = SoupStrainer("div", id=["sidebarSearch", "searchsearch"])
-    x = BeautifulSoup(html, "html.parser", parse_only=x)
+    x = make_soup(html, x)
     sidebar, select = cast(List[Tag], x.contents)
 
     return _menu(sidebar), _consoles(select)
@@ -0,0 +1,36 @@
+from typing import Final, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+try:
+    import lxml  # noqa: F401
+except ImportError:
+    lxml = None
+
+BACKENDS: Final = ("lxml", "html.parser") if lxml else ("html.parser",)
+"""Available tree builders. Fastest first."""
+
+_backend = BACKENDS[0]
+
+
+def set_backend(name: Optional[str]) -> None:
+    """Sets tree builder backend. Falls back to `html.parser` if not available."""
+
+    global _backend
+    _backend = name if name in BACKENDS else "html.parser"
+
+
+def get_backend() -> str:
+    return _backend
+
+
+def make_soup(html: str, parse_only: SoupStrainer) -> BeautifulSoup:
+    """Builds soup with current backend. Top level contains tags only."""
+
+    soup = BeautifulSoup(html, _backend, parse_only=parse_only)
+
+    # `lxml` keeps doctype (and may keep comments) outside of strainer.
+    for x in [x for x in soup.contents if not isinstance(x, Tag)]:
+        x.extract()
+
+    return soup
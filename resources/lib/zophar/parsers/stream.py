@@ -0,0 +1,277 @@
+from html.parser import HTMLParser
+from typing import Callable, Dict, Final, Iterator, List, Optional, Tuple, Union
+
+from .parser import PagesSupported, parse_page
+from .types import GameEntry
+
+_PAGE_IDS: Final = ("gamelistpage", "gamepage", "infopage")
+
+_Cell = Dict[str, Optional[str]]
+_Row = Dict[str, _Cell]
+
+
+class _Tokenizer(HTMLParser):
+    """Incremental gamelist page tokenizer.
+
+    Emits entries as soon as table rows are complete. Semantics are the same
+    as of `parse_gamelistpage`: only first table of page is parsed, its first
+    and last rows are headers."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.page_id: Optional[str] = None
+        self.title: Optional[str] = None
+        self.description: Optional[str] = None
+        self.page, self.total_pages = 1, 1
+        self.header = False
+        """Title, description and page numbers are parsed"""
+        self.entries: List[GameEntry] = []
+        """Completed entries not taken yet"""
+        self._depth = 0  # nesting of `div` tags inside page
+        self._text: Optional[List[str]] = None  # captured text
+        self._capture = ""  # name of field receiving captured text
+        self._link: Optional[int] = None  # start of link text in cell text
+        self._in_table = False
+        self._rows = 0
+        self._row: Optional[_Row] = None
+        self._pending: Optional[_Row] = None  # held back: last row is header
+        self._cell: Optional[_Cell] = None
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        attrs_ = dict(attrs)
+
+        if self._depth == 0:
+            if tag == "div" and self.page_id is None and attrs_.get("id") in _PAGE_IDS:
+                self.page_id, self._depth = attrs_["id"], 1
+
+            return
+
+        if tag == "div":
+            self._depth += 1
+
+        elif tag == "h2" and self.title is None:
+            self._start_capture("title")
+
+        elif tag == "p":
+            if "counter" in (attrs_.get("class") or "").split():
+                self._start_capture("counter")
+
+            elif self.description is None:
+                self._start_capture("description")
+
+        elif tag == "table" and not self.header:
+            self.header, self._in_table = True, True
+
+        elif not self._in_table:
+            return
+
+        elif tag == "tr":
+            if self._row is not None:
+                self._end_row()  # closing tag is optional
+
+            self._row = {}
+
+        elif tag == "td" and self._row is not None:
+            if cls := (attrs_.get("class") or "").split():
+                self._cell = {"text": None, "href": None, "src": None}
+                self._row.setdefault(cls[0], self._cell)
+                self._start_capture("cell")
+
+        elif self._cell is not None:
+            if tag == "a" and self._cell["href"] is None and self._text is not None:
+                # Link text is part of cell text too.
+                self._cell["href"] = attrs_.get("href")
+                self._link = len(self._text)
+
+            elif tag == "img" and self._cell["src"] is None:
+                self._cell["src"] = attrs_.get("src")
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._depth == 0:
+            return
+
+        if tag == "div":
+            if not (x := self._depth - 1):
+                self.header = True  # page without table
+
+            self._depth = x
+
+        elif tag in ("h2", "p", "td", "a"):
+            self._end_capture(tag)
+
+        elif tag == "tr" and self._row is not None:
+            self._end_row()
+
+        elif tag == "table" and self._in_table:
+            if self._row is not None:
+                self._end_row()
+
+            self._in_table = False
+
+    def handle_data(self, data: str) -> None:
+        if self._text is not None:
+            self._text.append(data)
+
+    def _start_capture(self, field: str) -> None:
+        self._text, self._capture = [], field
+
+    def _end_capture(self, tag: str) -> None:
+        if self._text is None:
+            return
+
+        parts, field = self._text, self._capture
+        text = "".join(parts)
+
+        if field == "title" and tag == "h2":
+            self.title = text
+
+        elif field == "description" and tag == "p":
+            self.description = text
+
+        elif field == "counter" and tag == "p":
+            # 'Page {npage} of {total_pages}'
+            _, npage, _, total = text.split()
+            self.page, self.total_pages = int(npage), int(total)
+            self.description = self.description or text
+
+        elif field == "cell" and tag == "a" and self._cell:
+            if self._link is not None:
+                self._cell["name"] = "".join(parts[self._link :])
+                self._link = None
+
+            return  # cell capture continues
+
+        elif field == "cell" and tag == "td" and self._cell:
+            self._cell["text"] = text
+            self._cell, self._link = None, None
+
+        else:
+            return
+
+        self._text = None
+
+    def _end_row(self) -> None:
+        row, self._row, self._cell = self._row, None, None
+        self._rows += 1
+
+        if self._rows == 1:
+            return  # first header
+
+        if (x := self._pending) is not None:
+            self.entries.append(_entry(x))
+
+        self._pending = row
+
+    def take(self) -> List[GameEntry]:
+        result, self.entries = self.entries, []
+        return result
+
+
+def _entry(row: _Row) -> GameEntry:
+    def _str(key: str) -> Optional[str]:
+        if (x := row.get(key)) is not None:
+            return x["text"] or None
+
+    name = row["name"]
+
+    if (cover := row.get("image", {}).get("src")) is not None:
+        # Replace URL with large image version (not so large, about 200px).
+        cover = cover.replace("/thumbs_small/", "/thumbs_large/")
+
+    return GameEntry(
+        name=str(name.get("name")),
+        path=str(name["href"]),
+        cover=cover,
+        year=_str("year"),
+        developer=_str("developer"),
+        console=_str("console"),
+    )
+
+
+class GameListStream:
+    """Gamelist page parsed while downloading.
+
+    Iteration yields entries as soon as table rows are complete. Iteration
+    is single pass."""
+
+    def __init__(
+        self,
+        tokenizer: _Tokenizer,
+        chunks: Iterator[str],
+        on_complete: Optional[Callable[[str], None]] = None,
+        consumed: Optional[List[str]] = None,
+    ) -> None:
+        self._tokenizer = tokenizer
+        self._chunks = chunks
+        self._on_complete = on_complete
+        self._consumed = consumed
+
+    @property
+    def title(self) -> str:
+        return self._tokenizer.title or ""
+
+    @property
+    def description(self) -> str:
+        return self._tokenizer.description or ""
+
+    @property
+    def entries(self) -> Iterator[GameEntry]:
+        return iter(self)
+
+    @property
+    def page(self) -> int:
+        return self._tokenizer.page
+
+    @property
+    def total_pages(self) -> int:
+        return self._tokenizer.total_pages
+
+    def __iter__(self) -> Iterator[GameEntry]:
+        tokenizer, consumed = self._tokenizer, self._consumed
+        yield from tokenizer.take()
+
+        for x in self._chunks:
+            if consumed is not None:
+                consumed.append(x)
+
+            tokenizer.feed(x)
+            yield from tokenizer.take()
+
+        tokenizer.close()
+        yield from tokenizer.take()
+
+        if self._on_complete and consumed is not None:
+            self._on_complete("".join(consumed))
+
+
+def stream_page(
+    chunks: Iterator[str],
+    on_complete: Optional[Callable[[str], None]] = None,
+) -> Union[GameListStream, PagesSupported]:
+    """Incrementally parses page from text chunks.
+
+    Gamelist pages are returned as `GameListStream` as soon as its header
+    is parsed. Other pages are read in full and parsed by `parse_page`.
+    `on_complete` is called with full page text after it is read."""
+
+    tokenizer, consumed = _Tokenizer(), []
+
+    for x in chunks:
+        consumed.append(x)
+        tokenizer.feed(x)
+
+        if (x := tokenizer.page_id) is not None:
+            if x != "gamelistpage" or tokenizer.header:
+                break
+
+    if tokenizer.page_id == "gamelistpage":
+        # Page text is kept only if somebody needs it.
+        consumed = consumed if on_complete else None
+        return GameListStream(tokenizer, chunks, on_complete, consumed)
+
+    html = "".join((*consumed, *chunks))
+
+    if on_complete:
+        on_complete(html)
+
+    return parse_page(html)
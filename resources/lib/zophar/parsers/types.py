@@ -2,8 +2,13 @@ from __future__ import annotations
 
 import dataclasses as dc
 import datetime as dt
+import sys
 from enum import Enum
-from typing import List, Mapping, Optional, Tuple
+from typing import List, Mapping, Optional, Tuple, Union
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return value if value is None else sys.intern(value)
 
 
 class ParseError(Exception):
@@ -43,16 +48,27 @@ class AudioFormat(Enum):
 class Browsable:
     """Browsable entity. Have `path` property."""
 
+    __slots__ = "name", "path"
+
     name: str
     """Name"""
     path: str
     """Encoded relative request path to webserver"""
 
 
+Menu = Mapping[str, List[Browsable]]
+"""Root menu mapping"""
+
+Platforms = Mapping[str, str]
+"""Mapping between platform name and search id"""
+
+
 @dc.dataclass
 class GameEntry(Browsable):
     """Game list entry"""
 
+    __slots__ = "cover", "year", "console", "developer"
+
     cover: Optional[str]
     """URL to cover image"""
     year: Optional[str]
@@ -62,18 +78,38 @@ class GameEntry(Browsable):
     developer: Optional[str]
     """Developer"""
 
+    def __post_init__(self) -> None:
+        # Few distinct values are repeated over thousands of entries.
+        self.year = _intern(self.year)
+        self.console = _intern(self.console)
+        self.developer = _intern(self.developer)
 
-@dc.dataclass
+
+@dc.dataclass(init=False)
 class AudioTrack:
     """Audiotrack. Part of media playlist."""
 
+    __slots__ = "title", "seconds", "mp3url"
+
     title: str
     """Title"""
-    length: dt.timedelta
-    """Duration"""
+    seconds: int
+    """Duration in whole seconds"""
     mp3url: str
     """URL to MP3 stream"""
 
+    def __init__(self, title: str, length: dt.timedelta, mp3url: str) -> None:
+        # Duration is stored as integer: it is smaller than `timedelta`.
+        self.title = title
+        self.seconds = int(length.total_seconds())
+        self.mp3url = mp3url
+
+    @property
+    def length(self) -> dt.timedelta:
+        """Duration"""
+
+        return dt.timedelta(seconds=self.seconds)
+
     def url(self, format: AudioFormat) -> str:
         """Returns URL to audio in specified format"""
 
@@ -87,6 +123,18 @@ class AudioTrack:
 class GamePage:
     """Represents page of game description"""
 
+    __slots__ = (
+        "name",
+        "console",
+        "cover",
+        "release_date",
+        "developer",
+        "publisher",
+        "originals",
+        "archives",
+        "tracks",
+    )
+
     name: str
     """Name"""
     console: str
@@ -114,6 +162,8 @@ class GamePage:
 class GameListPage:
     """Represents one page of gamelist"""
 
+    __slots__ = "entries", "title", "description", "page", "total_pages"
+
     entries: List[GameEntry]
     """Game entries list"""
     title: str
@@ -133,5 +183,10 @@ class GameListPage:
 class InfoPage:
     """Represents simple list of links"""
 
+    __slots__ = "entries", "description"
+
     entries: List[Browsable]
     description: str
+
+
+PagesSupported = Union[GameListPage, GamePage, InfoPage]
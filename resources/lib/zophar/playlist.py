@@ -0,0 +1,107 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Callable, Final, List, Optional
+
+from .browser import MAX_WORKERS, gamelist, gamelists, transient_page
+from .parsers import AudioFormat, GamePage
+from .scheduler import Priority, priority
+
+CHUNK_SIZE: Final = 32
+"""Number of games resolved between progress checkpoints"""
+
+
+def _m3u(game: GamePage, format: AudioFormat) -> str:
+    if not game.has_format(format):
+        format = AudioFormat.MP3
+
+    lines = []
+
+    for x in game.tracks:
+        lines.append(f"#EXTINF:{x.seconds},{game.name} - {x.title}")
+        lines.append(x.url(format))
+
+    return "".join(f"{x}\n" for x in lines)
+
+
+def build_playlist(
+    path: str,
+    file: str,
+    state: str,
+    format: AudioFormat = AudioFormat.MP3,
+    progress: Optional[Callable[[int, int], bool]] = None,
+) -> bool:
+    """Writes M3U playlist of all tracks of all games of gamelist `path`.
+    Returns `False` if aborted.
+
+    Playlist is written to `file` with `.part` suffix and renamed when it
+    is complete. Progress is saved to `state` file, so aborted build is
+    resumed. `progress(done, total)` is called with number of resolved
+    games. Build is aborted if it returns `False`."""
+
+    # All requests of build are requested at rate left by navigation and
+    # prefetch.
+    with priority(Priority.CRAWL):
+        first = gamelist(path, 1)
+        rest = gamelists(path, range(2, first.total_pages + 1))
+        entries = chain(first.entries, *(x.entries for x in rest))
+        games: List[str] = [x.path for x in entries]
+
+    try:
+        with open(state) as f:
+            x = json.load(f)
+
+        done, size = (x["done"], x["size"]) if x["path"] == path else (0, 0)
+
+    except (OSError, ValueError, KeyError):
+        done, size = 0, 0
+
+    part = file + ".part"
+
+    # Missing or shorter part would be padded by zeros: build is restarted.
+    try:
+        if os.path.getsize(part) < size:
+            done, size = 0, 0
+
+    except OSError:
+        done, size = 0, 0
+
+    def _resolve(path: str) -> str:
+        # Game pages are not stored to page cache of user navigation.
+        try:
+            with priority(Priority.CRAWL):
+                game = transient_page(path)
+
+        except Exception:
+            return ""  # broken game is skipped
+
+        return _m3u(game, format) if isinstance(game, GamePage) else ""
+
+    with open(part, "a+b") as f:
+        # Tail written after last checkpoint is dropped.
+        f.truncate(size)
+        f.seek(size)
+
+        if not size:
+            f.write(b"#EXTM3U\n")
+
+        with ThreadPoolExecutor(MAX_WORKERS) as pool:
+            while done < len(games):
+                chunk = games[done : done + CHUNK_SIZE]
+
+                for x in pool.map(_resolve, chunk):
+                    f.write(x.encode())
+
+                f.flush()
+                done, size = done + len(chunk), f.tell()
+
+                with open(state, "w") as s:
+                    json.dump({"path": path, "done": done, "size": size}, s)
+
+                if progress and progress(done, len(games)) is False:
+                    return False
+
+    os.replace(part, file)
+    os.remove(state)
+    return True
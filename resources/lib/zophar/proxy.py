@@ -0,0 +1,243 @@
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Final, Iterable, NamedTuple, Optional, Sequence, Set
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from .browser import get_transport
+from .scheduler import Priority, priority
+
+READ_AHEAD: Final = 1024 * 1024
+"""Number of bytes read ahead from the start of the next track"""
+
+MAX_BUFFERED: Final = 8 * 1024 * 1024
+"""Memory limit of read-ahead buffers"""
+
+SITE_HOSTS: Final = ("zophar.net",)
+"""Hosts (with subdomains) of streams allowed to be proxied"""
+
+_CHUNK_SIZE: Final = 64 * 1024
+_FORWARDED_HEADERS: Final = (
+    "Accept-Ranges",
+    "Content-Length",
+    "Content-Range",
+    "Content-Type",
+    "Last-Modified",
+)
+
+
+class _Buffered(NamedTuple):
+    data: bytes
+    """Head of stream"""
+    total: int
+    """Full stream size"""
+    type: str
+    """Content type"""
+
+
+def _range_start(value: Optional[str]) -> Optional[int]:
+    # Only open ranges `bytes={start}-` are served from read-ahead buffer.
+    if value and value.startswith("bytes=") and value.endswith("-"):
+        if (x := value[6:-1]).isdecimal():
+            return int(x)
+
+
+def _total_size(response: requests.Response) -> int:
+    if x := response.headers.get("Content-Range"):
+        return int(x.rpartition("/")[2])
+
+    return int(response.headers.get("Content-Length", 0))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "StreamProxy"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def send_response(self, code: int, message: Optional[str] = None) -> None:
+        self.responded = True
+        super().send_response(code, message)
+
+    def do_HEAD(self) -> None:
+        self._handle(body=False)
+
+    def do_GET(self) -> None:
+        self._handle(body=True)
+
+    def _handle(self, body: bool) -> None:
+        self.responded = False
+        query = parse_qs(urlsplit(self.path).query)
+
+        if not (url := query.get("url")):
+            return self.send_error(400)
+
+        # Only site streams are proxied: server must not be open relay.
+        if not all(map(self.server.allowed, url + query.get("next", []))):
+            return self.send_error(403)
+
+        if body and (next := query.get("next")):
+            self.server.read_ahead(next[0])
+
+        range = self.headers.get("Range")
+        start = _range_start(range) if range else 0
+        x = self.server.buffered(url[0])
+
+        try:
+            if x and start is not None and start < len(x.data):
+                self._send_buffered(url[0], x, start, range is not None, body)
+
+            else:
+                self._forward(url[0], range, body)
+
+        except ConnectionError:
+            self.close_connection = True  # player closed connection
+
+        except requests.RequestException:
+            # Player must not wait for the rest of response: failed remote
+            # is reported if response is not started, else it is cut.
+            if self.responded:
+                self.close_connection = True
+            else:
+                self.send_error(502)
+
+    def _send_buffered(
+        self, url: str, x: _Buffered, start: int, partial: bool, body: bool
+    ) -> None:
+        rest = None
+
+        if body and len(x.data) < x.total:
+            # Rest of stream must start right after buffer: remote server
+            # ignoring range is forwarded as is.
+            headers = {"Range": f"bytes={len(x.data)}-"}
+            rest = get_transport().stream(url, headers)
+
+            if rest.status_code != 206:
+                rest.close()
+                return self._forward(url, self.headers.get("Range"), body)
+
+        with rest or nullcontext():
+            self.send_response(206 if partial else 200)
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Content-Type", x.type)
+            self.send_header("Content-Length", str(x.total - start))
+
+            if partial:
+                end, total = x.total - 1, x.total
+                self.send_header("Content-Range", f"bytes {start}-{end}/{total}")
+
+            self.end_headers()
+
+            if not body:
+                return
+
+            self.wfile.write(x.data[start:])
+
+            if rest:
+                self._copy(rest.iter_content(_CHUNK_SIZE))
+
+    def _forward(self, url: str, range: Optional[str], body: bool) -> None:
+        headers = {"Range": range} if range else None
+
+        with get_transport().stream(url, headers) as response:
+            self.send_response(response.status_code)
+
+            for key in _FORWARDED_HEADERS:
+                if value := response.headers.get(key):
+                    self.send_header(key, value)
+
+            # Body of unknown length is terminated by closing connection.
+            if "Content-Length" not in response.headers:
+                self.close_connection = True
+
+            self.end_headers()
+
+            if body:
+                self._copy(response.iter_content(_CHUNK_SIZE))
+
+    def _copy(self, chunks: Iterable[bytes]) -> None:
+        for x in chunks:
+            self.wfile.write(x)
+
+
+class StreamProxy(ThreadingHTTPServer):
+    """Local HTTP proxy of audio streams with read-ahead of the next track.
+
+    Stream URL has `url` query parameter with remote URL and optional
+    `next` parameter with URL of the next track in playlist. Head of the
+    next track is read to bounded memory buffer while current one plays.
+    Streams of other than `hosts` are forbidden."""
+
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, hosts: Sequence[str] = SITE_HOSTS) -> None:
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.hosts = hosts
+        self._lock = threading.Lock()
+        self._buffers: "OrderedDict[str, _Buffered]" = OrderedDict()
+        self._pending: Set[str] = set()
+
+    def allowed(self, url: str) -> bool:
+        """Whether stream `url` is HTTP(S) URL of allowed host."""
+
+        x = urlsplit(url)
+        host = (x.hostname or "").lower()
+
+        if x.scheme not in ("http", "https"):
+            return False
+
+        return any(host == y or host.endswith(f".{y}") for y in self.hosts)
+
+    def buffered(self, url: str) -> Optional[_Buffered]:
+        with self._lock:
+            if (x := self._buffers.get(url)) is not None:
+                self._buffers.move_to_end(url)
+
+            return x
+
+    def read_ahead(self, url: str) -> None:
+        """Starts background reading of stream head to buffer."""
+
+        with self._lock:
+            if url in self._buffers or url in self._pending:
+                return
+
+            self._pending.add(url)
+
+        threading.Thread(target=self._read_ahead, args=(url,), daemon=True).start()
+
+    def _read_ahead(self, url: str) -> None:
+        data, headers = b"", {"Range": f"bytes=0-{READ_AHEAD - 1}"}
+
+        try:
+            # Playing track is served first.
+            with priority(Priority.PREFETCH):
+                response = get_transport().stream(url, headers)
+
+            with response:
+                response.raise_for_status()
+                total = _total_size(response)
+                type = response.headers["Content-Type"]
+
+                for x in response.iter_content(_CHUNK_SIZE):
+                    if len(data := data + x) >= READ_AHEAD:
+                        break
+
+        except (KeyError, ValueError, requests.RequestException):
+            return
+
+        finally:
+            with self._lock:
+                self._pending.discard(url)
+
+        with self._lock:
+            self._buffers[url] = _Buffered(data[:READ_AHEAD], total, type)
+            size = sum(len(x.data) for x in self._buffers.values())
+
+            # Ring of buffers: oldest are dropped over memory limit.
+            while size > MAX_BUFFERED:
+                size -= len(self._buffers.popitem(last=False)[1].data)
@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Final, List, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+from .transport import Transport
+
+_CHUNK_SIZE: Final = 16 * 1024
+# Bodies are stored decoded, so transfer headers are not recorded.
+_RECORDED_HEADERS: Final = ("Content-Type", "ETag", "Last-Modified")
+
+
+class Recording(NamedTuple):
+    """Recorded response"""
+
+    url: str
+    """Final URL"""
+    status: int
+    """HTTP status code"""
+    headers: Dict[str, str]
+    """Recorded response headers"""
+    body: bytes
+    """Decoded response body"""
+    redirected: bool
+    """Response was redirected"""
+
+
+def request_key(url: str, params: Optional[Mapping[str, str]] = None) -> str:
+    """Host independent key of request: path with sorted query."""
+
+    x = urlsplit(url)
+    query = sorted([*parse_qsl(x.query), *(params or {}).items()])
+    return f"{x.path}?{urlencode(query)}" if query else x.path
+
+
+class Recordings:
+    """Directory of recorded responses keyed by request."""
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest())
+
+    def save(self, key: str, response: requests.Response) -> None:
+        path = self._path(key)
+        headers = {k: v for k in _RECORDED_HEADERS if (v := response.headers.get(k))}
+        meta = {
+            "key": key,
+            "url": response.url,
+            "status": response.status_code,
+            "headers": headers,
+            "redirected": bool(response.history),
+        }
+
+        with open(path + ".body", "wb") as f:
+            f.write(response.content)
+
+        with open(path + ".json", "w") as f:
+            json.dump(meta, f)
+
+    def load(self, key: str) -> Optional[Recording]:
+        path = self._path(key)
+
+        try:
+            with open(path + ".json") as f:
+                meta: Dict[str, Any] = json.load(f)
+
+            with open(path + ".body", "rb") as f:
+                body = f.read()
+
+        except (OSError, ValueError):
+            return None
+
+        return Recording(
+            meta["url"], meta["status"], meta["headers"], body, meta["redirected"]
+        )
+
+
+class RecordingTransport(Transport):
+    """Transport saving all responses to recordings."""
+
+    def __init__(self, directory: str, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.recordings = Recordings(directory)
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Mapping[str, str]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        response = super().get(url, params, headers, stream)
+
+        # Not modified response has no body to record.
+        if response.status_code != 304:
+            self.recordings.save(request_key(url, params), response)
+
+        return response
+
+
+class ReplayTransport(Transport):
+    """Transport serving recorded responses without network.
+
+    Missing recordings are replied with `404 Not Found`."""
+
+    def __init__(self, directory: str, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.recordings = Recordings(directory)
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Mapping[str, str]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        start = time.monotonic()
+        response = requests.Response()
+        response.url = url
+
+        if (x := self.recordings.load(request_key(url, params))) is None:
+            response.status_code, response._content = 404, b""
+
+        else:
+            response.status_code, response._content = x.status, x.body
+            response.headers.update(x.headers)
+            response.url = x.url
+
+            if x.redirected:
+                response.history = [requests.Response()]
+
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        size = len(response.content)
+        self._record(response.url, response.status_code, size, start, 1)
+        return response
+
+    def stream(
+        self, url: str, headers: Optional[Mapping[str, str]] = None
+    ) -> requests.Response:
+        return self.get(url, headers=headers, stream=True)
+
+
+def _byte_range(value: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    # Single range `bytes={start}-[{end}]` only. End is exclusive in result.
+    if not value or not value.startswith("bytes="):
+        return None
+
+    start, _, end = value[6:].partition("-")
+
+    if not start.isdecimal() or end and not end.isdecimal():
+        return None
+
+    return int(start), min(size, int(end) + 1) if end else size
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "MockServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        server = self.server
+        server.served.append((self.path, self.headers.get("Range")))
+
+        if server.latency:
+            time.sleep(server.latency)
+
+        if random.random() < server.error_rate:
+            return self.send_error(503)
+
+        if (x := server.recordings.load(request_key(self.path))) is None:
+            return self.send_error(404)
+
+        etag = x.headers.get("ETag")
+
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            return self.end_headers()
+
+        status, body, size = x.status, x.body, len(x.body)
+        requested = _byte_range(self.headers.get("Range"), size)
+
+        if server.ranges and requested and status == 200:
+            if (start := requested[0]) >= size:
+                return self.send_error(416)
+
+            status, body = 206, body[start : requested[1]]
+
+        self.send_response(status)
+
+        for key, value in x.headers.items():
+            self.send_header(key, value)
+
+        if server.ranges:
+            self.send_header("Accept-Ranges", "bytes")
+
+        if status == 206:
+            end = start + len(body) - 1
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        for n in range(0, len(body), _CHUNK_SIZE):
+            self.wfile.write(chunk := body[n : n + _CHUNK_SIZE])
+
+            if server.bandwidth:
+                time.sleep(len(chunk) / server.bandwidth)
+
+
+class MockServer(ThreadingHTTPServer):
+    """Local HTTP server of recorded responses with simulated network.
+
+    Use its `url` as base URL of browser (see `set_base_url`)."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        directory: str,
+        port: int = 0,
+        latency: float = 0,
+        bandwidth: float = 0,
+        error_rate: float = 0,
+        ranges: bool = True,
+    ) -> None:
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.recordings = Recordings(directory)
+        self.latency = latency
+        """Delay before response (seconds)"""
+        self.bandwidth = bandwidth
+        """Body transfer rate limit (bytes per second). Zero is unlimited."""
+        self.error_rate = error_rate
+        """Probability of `503 Service Unavailable` response"""
+        self.ranges = ranges
+        """Byte ranges are supported. Else full body is always replied."""
+        self.served: List[Tuple[str, Optional[str]]] = []
+        """Path and `Range` header of each served request"""
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def start(self) -> None:
+        """Serves requests in background thread."""
+
+        threading.Thread(target=self.serve_forever, daemon=True).start()
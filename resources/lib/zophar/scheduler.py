@@ -0,0 +1,238 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Callable, Final, Iterator, Optional, TypeVar
+
+_SCHEMA: Final = """
+CREATE TABLE IF NOT EXISTS bucket (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL,
+    blocked REAL NOT NULL,
+    penalty REAL NOT NULL,
+    rate REAL NOT NULL,
+    burst INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS waiters (
+    id TEXT PRIMARY KEY,
+    priority INTEGER NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+RATE_LIMIT: Final = 4.0
+"""Default number of requests per second"""
+
+BURST: Final = 8
+"""Default bucket size: number of requests sent without delay"""
+
+POLL_INTERVAL: Final = 0.25
+"""Maximum sleep between bucket checks (seconds)"""
+
+MAX_PENALTY: Final = 16.0
+"""Maximum slowdown factor of request rate after throttled responses"""
+
+MAX_BACKOFF: Final = 30.0
+"""Maximum pause of all requests after throttled response (seconds)"""
+
+_RECOVERY: Final = 0.9
+_THROTTLED: Final = (429, 503)
+
+_T = TypeVar("_T")
+
+
+class Priority(IntEnum):
+    """Request priority class. Lower value is served first."""
+
+    NAVIGATION = 0
+    """Pages user is waiting for"""
+    PREFETCH = 1
+    """Pages and images user will probably need soon"""
+    CRAWL = 2
+    """Bulk background jobs"""
+
+
+_local = threading.local()
+
+
+def current_priority() -> Priority:
+    """Priority of requests of current thread."""
+
+    return getattr(_local, "priority", Priority.NAVIGATION)
+
+
+@contextmanager
+def priority(value: Priority) -> Iterator[None]:
+    """Requests of current thread are scheduled with `value` priority."""
+
+    previous, _local.priority = current_priority(), value
+
+    try:
+        yield
+
+    finally:
+        _local.priority = previous
+
+
+def inherit_priority(func: Callable[..., _T]) -> Callable[..., _T]:
+    """Wraps `func` to run with priority of calling thread in worker thread."""
+
+    value = current_priority()
+
+    def _run(*args: Any, **kwargs: Any) -> _T:
+        with priority(value):
+            return func(*args, **kwargs)
+
+    return _run
+
+
+class RateLimiter:
+    """Token bucket rate limit of requests shared by processes via SQLite.
+
+    Lower priority request leaves part of bucket to higher ones and yields
+    while any higher priority request is waiting. Throttled responses pause
+    all requests and slow down refill until requests succeed again.
+    Default in-memory limiter is shared by threads of process only."""
+
+    def __init__(
+        self, path: str = ":memory:", rate: float = RATE_LIMIT, burst: int = BURST
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._penalty = 1.0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            path, timeout=10, isolation_level=None, check_same_thread=False
+        )
+        self._db.execute("PRAGMA synchronous = NORMAL")
+
+        # Limiter is created by every plugin invocation: existing bucket
+        # with same parameters is used without writes.
+        try:
+            x = self._db.execute("SELECT rate, burst FROM bucket").fetchone()
+
+        except sqlite3.OperationalError:
+            # Bucket of older schema is recreated: its state is transient.
+            self._db.execute("DROP TABLE IF EXISTS bucket")
+            x = None
+
+        if x != (rate, burst):
+            self._setup()
+
+    def _setup(self) -> None:
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.executescript(_SCHEMA)
+        self._db.execute(
+            "INSERT OR IGNORE INTO bucket VALUES (0, ?, ?, 0, 1, ?, ?)",
+            (self.burst, time.time(), self.rate, self.burst),
+        )
+        self._db.execute(
+            "UPDATE bucket SET rate = ?, burst = ?", (self.rate, self.burst)
+        )
+
+    def _reserve(self, priority: Priority) -> float:
+        # Tokens left to higher priorities: none, quarter and half of bucket.
+        return self.burst * priority / 4
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # Immediate transaction locks database for other processes.
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+
+            try:
+                yield self._db
+
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+            self._db.execute("COMMIT")
+
+    def _try_acquire(self, id: str, priority: Priority) -> float:
+        """Takes token. Returns `0` on success or delay before next try."""
+
+        now = time.time()
+
+        with self._transaction() as db:
+            tokens, updated, blocked, penalty = db.execute(
+                "SELECT tokens, updated, blocked, penalty FROM bucket"
+            ).fetchone()
+
+            self._penalty, rate = penalty, self.rate / penalty
+            tokens = min(self.burst, tokens + max(0, now - updated) * rate)
+            db.execute("DELETE FROM waiters WHERE expires < ?", (now,))
+
+            if now < blocked:
+                delay = blocked - now
+
+            elif db.execute(
+                "SELECT 1 FROM waiters WHERE priority < ? LIMIT 1", (priority,)
+            ).fetchone():
+                delay = POLL_INTERVAL
+
+            elif tokens >= (need := 1 + self._reserve(priority)):
+                db.execute(
+                    "UPDATE bucket SET tokens = ?, updated = ?", (tokens - 1, now)
+                )
+                db.execute("DELETE FROM waiters WHERE id = ?", (id,))
+                return 0
+
+            else:
+                delay = (need - tokens) / rate
+
+            # Waiter mark outlives next poll only, so killed process
+            # does not block others.
+            expires = now + 2 * POLL_INTERVAL
+            db.execute(
+                "INSERT OR REPLACE INTO waiters VALUES (?, ?, ?)",
+                (id, priority, expires),
+            )
+            db.execute("UPDATE bucket SET tokens = ?, updated = ?", (tokens, now))
+
+        return delay
+
+    def acquire(self, priority: Optional[Priority] = None) -> None:
+        """Waits for permission to send request. Priority of current thread
+        is used by default."""
+
+        if priority is None:
+            priority = current_priority()
+
+        id = f"{os.getpid()}.{threading.get_ident()}"
+
+        while delay := self._try_acquire(id, priority):
+            time.sleep(min(delay, POLL_INTERVAL))
+
+    def report(self, status: int, retry_after: Optional[float] = None) -> None:
+        """Adapts rate to response status. `429 Too Many Requests` and
+        `503 Service Unavailable` pause requests for `retry_after` seconds
+        (exponential backoff by default) and halve rate."""
+
+        if status in _THROTTLED:
+            now = time.time()
+
+            with self._transaction() as db:
+                (penalty,) = db.execute("SELECT penalty FROM bucket").fetchone()
+                penalty = min(MAX_PENALTY, penalty * 2)
+
+                if retry_after is None:
+                    retry_after = penalty / 2
+
+                blocked = now + min(MAX_BACKOFF, retry_after)
+                db.execute(
+                    "UPDATE bucket SET tokens = 0, updated = ?, penalty = ?, "
+                    "blocked = MAX(blocked, ?)",
+                    (now, penalty, blocked),
+                )
+
+        elif status and status < 500 and self._penalty > 1:
+            # Rate is restored gradually.
+            with self._lock:
+                self._db.execute(
+                    "UPDATE bucket SET penalty = MAX(1, penalty * ?) WHERE penalty > 1",
+                    (_RECOVERY,),
+                )
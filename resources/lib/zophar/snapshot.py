@@ -0,0 +1,380 @@
+import datetime as dt
+import mmap
+import os
+import struct
+import time
+from typing import (
+    Callable,
+    Dict,
+    Final,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+from .parsers import (
+    AudioFormat,
+    AudioTrack,
+    Browsable,
+    GameEntry,
+    GameListPage,
+    GamePage,
+    InfoPage,
+    Menu,
+    PagesSupported,
+    Platforms,
+)
+
+# Binary layout (little endian):
+#   header: magic, version, kind
+#   string table: count, `count + 1` offsets, UTF-8 data
+#   body: kind specific records of fixed size integers. Strings are
+#   indexes in string table, `_NONE` is `None`.
+_MAGIC: Final = b"ZPH"
+_VERSION: Final = 2
+_HEADER: Final = struct.Struct("<3sBB")
+_U8: Final = struct.Struct("<B")
+_U32: Final = struct.Struct("<I")
+_NONE: Final = 0xFFFFFFFF
+
+_SEARCHPAGE, _GAMELISTPAGE, _GAMEPAGE, _INFOPAGE = 1, 2, 3, 4
+
+_ENTRY: Final = struct.Struct("<6I")
+_FORMATS: Final = (AudioFormat.MP3, AudioFormat.FLAC)
+"""Audio formats by byte code. Only appended."""
+
+
+class SnapshotError(Exception):
+    """Unsupported or broken snapshot"""
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self._strings: Dict[str, int] = {}
+        self._body: List[bytes] = []
+
+    def str(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NONE
+
+        # Equal strings (console, developer, year) are stored once.
+        return self._strings.setdefault(value, len(self._strings))
+
+    def pack(self, fmt: struct.Struct, *values: int) -> None:
+        self._body.append(fmt.pack(*values))
+
+    def strs(self, *values: Optional[str]) -> None:
+        for x in values:
+            self.pack(_U32, self.str(x))
+
+    def getvalue(self, kind: int) -> bytes:
+        data = [x.encode() for x in self._strings]
+        offsets, n = [0], 0
+
+        for x in data:
+            offsets.append(n := n + len(x))
+
+        return b"".join(
+            (
+                _HEADER.pack(_MAGIC, _VERSION, kind),
+                _U32.pack(len(data)),
+                struct.pack(f"<{len(offsets)}I", *offsets),
+                *data,
+                *self._body,
+            )
+        )
+
+
+class _Reader:
+    def __init__(self, buffer: Union[bytes, mmap.mmap]) -> None:
+        self._view = memoryview(buffer)
+        self._cache: Dict[int, str] = {}
+
+        try:
+            self._read_header()
+
+        except (struct.error, SnapshotError) as e:
+            self._view.release()
+            raise SnapshotError(e) from None
+
+    def _read_header(self) -> None:
+        magic, version, self.kind = _HEADER.unpack_from(self._view)
+
+        if magic != _MAGIC or version != _VERSION:
+            raise SnapshotError("Unsupported snapshot version")
+
+        (count,) = _U32.unpack_from(self._view, _HEADER.size)
+        pos = _HEADER.size + _U32.size
+        self._offsets = struct.unpack_from(f"<{count + 1}I", self._view, pos)
+        self._data = pos + 4 * (count + 1)
+        self.pos = self._data + self._offsets[-1]
+
+        if self.pos > len(self._view):
+            raise SnapshotError("Truncated snapshot")
+
+    def release(self) -> None:
+        self._view.release()
+
+    def str(self, index: int) -> Optional[str]:
+        # Strings are decoded on first access only.
+        if index == _NONE:
+            return None
+
+        if (x := self._cache.get(index)) is None:
+            start, end = self._offsets[index], self._offsets[index + 1]
+            x = str(self._view[self._data + start : self._data + end], "utf-8")
+            self._cache[index] = x
+
+        return x
+
+    def unpack(self, fmt: struct.Struct) -> Tuple[int, ...]:
+        try:
+            result = fmt.unpack_from(self._view, self.pos)
+
+        except struct.error as e:
+            raise SnapshotError(e) from e
+
+        self.pos += fmt.size
+        return result
+
+    def u8(self) -> int:
+        return self.unpack(_U8)[0]
+
+    def u32(self) -> int:
+        return self.unpack(_U32)[0]
+
+    def strs(self, n: int) -> List[Optional[str]]:
+        return [self.str(self.u32()) for _ in range(n)]
+
+    def skip(self, size: int) -> int:
+        """Skips `size` bytes. Returns their position."""
+
+        if (pos := self.pos) + size > len(self._view):
+            raise SnapshotError("Truncated snapshot")
+
+        self.pos += size
+        return pos
+
+    def entry(self, pos: int) -> GameEntry:
+        name, path, cover, year, console, developer = map(
+            self.str, _ENTRY.unpack_from(self._view, pos)
+        )
+
+        return GameEntry(
+            name=str(name),
+            path=str(path),
+            cover=cover,
+            year=year,
+            console=console,
+            developer=developer,
+        )
+
+
+class _Entries(Sequence[GameEntry]):
+    """Gamelist entries decoded on access."""
+
+    def __init__(self, reader: _Reader, pos: int, count: int) -> None:
+        self._reader, self._pos, self._count = reader, pos, count
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> GameEntry: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[GameEntry]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[x] for x in range(*index.indices(self._count))]
+
+        if not -self._count <= index < self._count:
+            raise IndexError(index)
+
+        index %= self._count
+        return self._reader.entry(self._pos + index * _ENTRY.size)
+
+    def __iter__(self) -> Iterator[GameEntry]:
+        return map(self.__getitem__, range(self._count))
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Sequence) and list(self) == list(other)
+
+
+def _dump_browsables(w: _Writer, items: Sequence[Browsable]) -> None:
+    w.pack(_U32, len(items))
+
+    for x in items:
+        w.strs(x.name, x.path)
+
+
+def _load_browsables(r: _Reader) -> List[Browsable]:
+    return [Browsable(*map(str, r.strs(2))) for _ in range(r.u32())]
+
+
+def _dump_searchpage(w: _Writer, menu: Menu, platforms: Platforms) -> None:
+    w.pack(_U32, len(menu))
+
+    for name, items in menu.items():
+        w.strs(name)
+        _dump_browsables(w, items)
+
+    w.pack(_U32, len(platforms))
+
+    for x in platforms.items():
+        w.strs(*x)
+
+
+def _load_searchpage(r: _Reader) -> Tuple[Menu, Platforms]:
+    menu = {str(r.str(r.u32())): _load_browsables(r) for _ in range(r.u32())}
+    platforms = {str(k): str(v) for k, v in (r.strs(2) for _ in range(r.u32()))}
+    return menu, platforms
+
+
+def _dump_gamelistpage(w: _Writer, page: GameListPage) -> None:
+    w.strs(page.title, page.description)
+    w.pack(_U32, page.page)
+    w.pack(_U32, page.total_pages)
+    w.pack(_U32, len(page.entries))
+
+    for x in page.entries:
+        values = x.name, x.path, x.cover, x.year, x.console, x.developer
+        w.pack(_ENTRY, *map(w.str, values))
+
+
+def _load_gamelistpage(r: _Reader) -> GameListPage:
+    title, description = map(str, r.strs(2))
+    page, total_pages, count = r.u32(), r.u32(), r.u32()
+    entries = _Entries(r, r.skip(count * _ENTRY.size), count)
+    # Fixed size records are decoded lazily by `_Entries`.
+    return GameListPage(entries, title, description, page, total_pages)  # type: ignore
+
+
+def _dump_gamepage(w: _Writer, page: GamePage) -> None:
+    w.strs(page.name, page.console, page.cover, page.release_date)
+    w.strs(page.developer, page.publisher, page.originals)
+    w.pack(_U8, len(page.archives))
+
+    for format, url in page.archives.items():
+        w.pack(_U8, _FORMATS.index(format))
+        w.strs(url)
+
+    w.pack(_U32, len(page.tracks))
+
+    for x in page.tracks:
+        w.strs(x.title)
+        w.pack(_U32, x.seconds)
+        w.strs(x.mp3url)
+
+
+def _load_gamepage(r: _Reader) -> GamePage:
+    name, console, cover, release_date = r.strs(4)
+    developer, publisher, originals = r.strs(3)
+    archives = {_FORMATS[r.u8()]: str(r.str(r.u32())) for _ in range(r.u8())}
+
+    def _track() -> AudioTrack:
+        title, seconds, url = r.str(r.u32()), r.u32(), r.str(r.u32())
+        return AudioTrack(str(title), dt.timedelta(seconds=seconds), str(url))
+
+    return GamePage(
+        name=str(name),
+        console=str(console),
+        cover=cover,
+        release_date=release_date,
+        developer=developer,
+        publisher=publisher,
+        originals=originals,
+        archives=archives,
+        tracks=tuple(_track() for _ in range(r.u32())),
+    )
+
+
+def _dump_infopage(w: _Writer, page: InfoPage) -> None:
+    w.strs(page.description)
+    _dump_browsables(w, page.entries)
+
+
+def _load_infopage(r: _Reader) -> InfoPage:
+    description = str(r.str(r.u32()))
+    return InfoPage(_load_browsables(r), description)
+
+
+_DUMPERS: Final[Dict[type, Tuple[int, Callable]]] = {
+    GameListPage: (_GAMELISTPAGE, _dump_gamelistpage),
+    GamePage: (_GAMEPAGE, _dump_gamepage),
+    InfoPage: (_INFOPAGE, _dump_infopage),
+}
+
+_LOADERS: Final[Dict[int, Callable[[_Reader], PagesSupported]]] = {
+    _GAMELISTPAGE: _load_gamelistpage,
+    _GAMEPAGE: _load_gamepage,
+    _INFOPAGE: _load_infopage,
+}
+
+
+def dumps_page(page: PagesSupported) -> bytes:
+    """Serializes parsed page to compact binary snapshot."""
+
+    kind, dump = _DUMPERS[type(page)]
+    dump(w := _Writer(), page)
+    return w.getvalue(kind)
+
+
+def loads_page(data: Union[bytes, mmap.mmap]) -> PagesSupported:
+    """Deserializes parsed page. Gamelist entries are decoded on access."""
+
+    if (load := _LOADERS.get((r := _Reader(data)).kind)) is None:
+        raise SnapshotError("Not a page snapshot")
+
+    try:
+        return load(r)
+
+    except (IndexError, UnicodeDecodeError) as e:
+        raise SnapshotError(e) from e
+
+
+def _write(path: str, data: bytes) -> None:
+    with open(tmp := path + ".tmp", "wb") as f:
+        f.write(data)
+
+    os.replace(tmp, path)
+
+
+def dump_searchpage(path: str, menu: Menu, platforms: Platforms) -> None:
+    """Atomically saves parsed search page to snapshot file."""
+
+    _dump_searchpage(w := _Writer(), menu, platforms)
+    _write(path, w.getvalue(_SEARCHPAGE))
+
+
+def load_searchpage(path: str) -> Optional[Tuple[Menu, Platforms]]:
+    """Loads parsed search page from snapshot. `None` if it is missing or invalid."""
+
+    try:
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                r = _Reader(m)
+
+                try:
+                    return _load_searchpage(r) if r.kind == _SEARCHPAGE else None
+
+                finally:
+                    r.release()  # mapping can not be closed while it is viewed
+
+    except (OSError, ValueError, IndexError, SnapshotError):
+        return None
+
+
+def snapshot_age(path: str) -> float:
+    """Age of snapshot file in seconds. Infinity if file is missing."""
+
+    try:
+        return time.time() - os.path.getmtime(path)
+
+    except OSError:
+        return float("inf")
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Final, List, Mapping, NamedTuple, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:
+    from .scheduler import RateLimiter
+
+try:
+    import brotli  # urllib3 decodes `br` content if available
+except ImportError:
+    brotli = None
+
+_ENCODINGS: Final = "gzip, deflate, br" if brotli else "gzip, deflate"
+
+_RETRY_EXCEPTIONS: Final = (requests.ConnectionError, requests.Timeout)
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    # HTTP date form is rare and treated as missing.
+    try:
+        return float(response.headers["Retry-After"])
+
+    except (KeyError, ValueError):
+        return None
+
+
+class RequestStats(NamedTuple):
+    """Timing statistics of completed request"""
+
+    url: str
+    """Requested URL"""
+    status: int
+    """HTTP status code. Zero on connection failure."""
+    size: int
+    """Response body size in bytes"""
+    elapsed: float
+    """Wall time in seconds including retries"""
+    attempts: int
+    """Number of attempts"""
+
+
+class Transport:
+    """Shared HTTP transport with keep-alive pool, timeouts and retries.
+
+    Each attempt of `get` waits for `limiter` and reports its status to it."""
+
+    def __init__(
+        self,
+        connect_timeout: float = 5,
+        read_timeout: float = 15,
+        retries: int = 3,
+        backoff: float = 0.5,
+        pool_size: int = 4,
+        limiter: Optional[RateLimiter] = None,
+    ) -> None:
+        self.timeout = connect_timeout, read_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.limiter = limiter
+        self.stats: List[RequestStats] = []
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._session.headers["Accept-Encoding"] = _ENCODINGS
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def _sleep(self, attempt: int) -> None:
+        # Exponential backoff with full jitter.
+        time.sleep(random.uniform(0, self.backoff * 2**attempt))
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Mapping[str, str]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """GET request. Retries on connection errors, 5xx and `429` responses.
+
+        If `stream` is set, body is not read and response must be closed."""
+
+        start, attempt = time.monotonic(), 0
+
+        while True:
+            attempt += 1
+
+            if self.limiter:
+                self.limiter.acquire()
+
+            try:
+                response = self._session.get(
+                    url,
+                    params=params,
+                    headers=headers,
+                    timeout=self.timeout,
+                    stream=stream,
+                )
+
+            except _RETRY_EXCEPTIONS:
+                if attempt > self.retries:
+                    self._record(url, 0, 0, start, attempt)
+                    raise
+
+            else:
+                status = response.status_code
+
+                if self.limiter:
+                    self.limiter.report(status, _retry_after(response))
+
+                if status < 500 and status != 429 or attempt > self.retries:
+                    if stream:
+                        size = int(response.headers.get("Content-Length", 0))
+                    else:
+                        size = len(response.content)
+
+                    self._record(response.url, status, size, start, attempt)
+                    return response
+
+                response.close()
+
+            self._sleep(attempt - 1)
+
+    def stream(
+        self, url: str, headers: Optional[Mapping[str, str]] = None
+    ) -> requests.Response:
+        """Streamed GET request of binary content. Waits for `limiter` as `get`
+        does, but is not retried. Response must be closed."""
+
+        # Content encoding would break byte ranges.
+        headers = {**(headers or {}), "Accept-Encoding": "identity"}
+
+        if self.limiter:
+            self.limiter.acquire()
+
+        response = self._session.get(
+            url, headers=headers, timeout=self.timeout, stream=True
+        )
+
+        if self.limiter:
+            self.limiter.report(response.status_code, _retry_after(response))
+
+        return response
+
+    def _record(self, url: str, status: int, size: int, start: float, attempts: int):
+        elapsed = time.monotonic() - start
+
+        with self._lock:
+            self.stats.append(RequestStats(url, status, size, elapsed, attempts))
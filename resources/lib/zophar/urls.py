@@ -0,0 +1,12 @@
+from typing import Optional
+from urllib.parse import urlencode
+
+# Item URLs are built on every gamepage view: this module must not import
+# network or server stacks.
+
+
+def proxy_url(port: int, url: str, next: Optional[str] = None) -> str:
+    """URL of remote stream `url` proxied by local server on `port`."""
+
+    params = {"url": url, "next": next} if next else {"url": url}
+    return f"http://127.0.0.1:{port}/stream?{urlencode(params)}"
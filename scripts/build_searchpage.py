@@ -0,0 +1,34 @@
+"""Builds search page snapshot bundled with addon.
+
+Usage: python scripts/build_searchpage.py [HTML_FILE]
+
+Search page is downloaded unless saved `HTML_FILE` is given. Snapshot is
+written to `resources/searchpage.bin` and loaded on first run of addon
+instead of downloading search page."""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from resources.lib import zophar  # noqa: E402
+
+OUTPUT = os.path.join(ROOT, "resources", "searchpage.bin")
+
+
+def main(argv):
+    if argv:
+        with open(argv[0], encoding="utf-8") as f:
+            menu, platforms = zophar.parsers.parse_searchpage(f.read())
+
+    else:
+        menu, platforms = zophar.home()
+
+    zophar.dump_searchpage(OUTPUT, menu, platforms)
+    sections = ", ".join(f"{k} ({len(v)})" for k, v in menu.items())
+    print(f"{OUTPUT}: {sections}, {len(platforms)} platforms")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,4 @@
+import resources.lib.service as service
+
+if __name__ == "__main__":
+    service.run()
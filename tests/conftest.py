@@ -0,0 +1,96 @@
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Mapping, Union
+
+import pytest
+import requests
+
+from resources.lib.zophar import browser
+from resources.lib.zophar.parsers import soup
+from resources.lib.zophar.replay import MockServer, Recordings
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+PAGES = (
+    "gamelist",
+    "gamelist_page1",
+    "gamepage",
+    "infopage",
+    "search_empty",
+    "search_results",
+)
+"""HTML fixtures of pages supported by `parse_page`"""
+
+
+@pytest.fixture
+def fixture() -> Callable[[str], str]:
+    """Returns text of HTML fixture by name."""
+
+    def _read(name: str) -> str:
+        return (FIXTURES / f"{name}.html").read_text(encoding="utf-8")
+
+    return _read
+
+
+@pytest.fixture(params=soup.BACKENDS)
+def backend(request: pytest.FixtureRequest) -> Iterator[str]:
+    """Runs test with each available tree builder."""
+
+    previous = soup.get_backend()
+    soup.set_backend(request.param)
+    yield request.param
+    soup.set_backend(previous)
+
+
+Site = Callable[..., MockServer]
+
+
+@pytest.fixture
+def site(tmp_path: Path) -> Iterator[Site]:
+    """Starts `MockServer` replying bodies by request key (path and sorted
+    query) with additional `headers`. Text bodies are HTML pages."""
+
+    servers: List[MockServer] = []
+
+    def _serve(
+        routes: Mapping[str, Union[str, bytes]],
+        headers: Mapping[str, str] = {},
+        **options: Any,
+    ):
+        recordings = Recordings(str(tmp_path / f"site{len(servers)}"))
+
+        for key, body in routes.items():
+            response = requests.Response()
+            response.status_code, response.url = 200, key
+            response.headers.update(headers)
+
+            if isinstance(body, str):
+                response.headers["Content-Type"] = "text/html; charset=utf-8"
+                body = body.encode()
+
+            else:
+                response.headers["Content-Type"] = "application/octet-stream"
+
+            response._content = body
+            recordings.save(key, response)
+
+        servers.append(server := MockServer(recordings.directory, **options))
+        server.start()
+        return server
+
+    yield _serve
+
+    for x in servers:
+        x.shutdown()
+        x.server_close()
+
+
+@pytest.fixture
+def offline() -> Iterator[None]:
+    """Browser state (base URL, transport and page cache) is restored after
+    test."""
+
+    state = browser.BASE_URL, browser._cache, browser._transport
+    options = browser._transport_options
+    yield
+    browser.BASE_URL, browser._cache, browser._transport = state
+    browser._transport_options = options
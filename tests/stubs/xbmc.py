@@ -0,0 +1,49 @@
+"""Headless stub of Kodi `xbmc` module."""
+
+from typing import Any, Dict, List, Tuple
+
+LOGDEBUG, LOGINFO, LOGWARNING, LOGERROR, LOGFATAL = range(5)
+
+LOG: List[Tuple[int, str]] = []
+"""Logged messages with levels"""
+
+
+def log(msg: str, level: int = LOGDEBUG) -> None:
+    LOG.append((level, msg))
+
+
+def getLocalizedString(id: int) -> str:
+    return f"#{id}"
+
+
+def getGlobalIdleTime() -> int:
+    return 0
+
+
+class InfoTagMusic:
+    """Records values set by `set*` methods."""
+
+    def __init__(self) -> None:
+        self.values: Dict[str, Any] = {}
+
+    def __getattr__(self, name: str):
+        if not name.startswith("set"):
+            raise AttributeError(name)
+
+        def _set(value: Any) -> None:
+            self.values[name[3].lower() + name[4:]] = value
+
+        return _set
+
+
+class Monitor:
+    def abortRequested(self) -> bool:
+        return False
+
+    def waitForAbort(self, timeout: float = 0) -> bool:
+        return True
+
+
+class Player:
+    def isPlaying(self) -> bool:
+        return False
@@ -0,0 +1,64 @@
+"""Headless stub of Kodi `xbmcaddon` module.
+
+Settings defaults and English strings are read from addon resources.
+Settings are changed by updating `SETTINGS`."""
+
+import os
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESOURCES = os.path.join(ROOT, "resources")
+STRINGS = os.path.join(RESOURCES, "language", "resource.language.en_gb", "strings.po")
+
+
+def _defaults() -> Dict[str, str]:
+    tree = ET.parse(os.path.join(RESOURCES, "settings.xml"))
+    return {
+        x.get("id"): x.get("default", "") for x in tree.iter("setting") if x.get("id")
+    }
+
+
+def _strings() -> Dict[int, str]:
+    with open(STRINGS, encoding="utf-8") as f:
+        return {
+            int(id): text
+            for id, text in re.findall(r'msgctxt "#(\d+)"\nmsgid "(.*)"', f.read())
+        }
+
+
+SETTINGS: Dict[str, str] = _defaults()
+"""Current settings values. Changes are seen by `Addon.getSettings()`."""
+
+_STRINGS = _strings()
+
+
+class Settings:
+    def getBool(self, id: str) -> bool:
+        return str(SETTINGS.get(id)).lower() == "true"
+
+    def getInt(self, id: str) -> int:
+        return int(SETTINGS.get(id) or 0)
+
+    def getString(self, id: str) -> str:
+        return str(SETTINGS.get(id, ""))
+
+
+class Addon:
+    def __init__(self, id: str = "plugin.audio.zophar") -> None:
+        self._info = {
+            "id": id,
+            "name": "Zophar's Domain",
+            "path": ROOT,
+            "profile": f"special://profile/addon_data/{id}/",
+        }
+
+    def getAddonInfo(self, id: str) -> str:
+        return self._info[id]
+
+    def getSettings(self) -> Settings:
+        return Settings()
+
+    def getLocalizedString(self, id: int) -> str:
+        return _STRINGS.get(id, "")
@@ -0,0 +1,101 @@
+"""Headless stub of Kodi `xbmcgui` module."""
+
+from typing import Any, Dict, List, Tuple
+
+import xbmc
+
+PROPERTIES: Dict[str, str] = {}
+"""Window properties (shared by all windows)"""
+
+NOTIFICATIONS: List[Tuple[Any, ...]] = []
+"""Arguments of shown notifications and dialogs"""
+
+
+class ListItem:
+    def __init__(self, label: str = "", label2: str = "", path: str = "") -> None:
+        self.label, self.label2, self.path = label, label2, path
+        self.art: Dict[str, str] = {}
+        self.properties: Dict[str, str] = {}
+        self.context_menu: List[Tuple[str, str]] = []
+        self.mimetype = ""
+        self._tag = xbmc.InfoTagMusic()
+
+    def __repr__(self) -> str:
+        return f"ListItem({self.label!r})"
+
+    def getLabel(self) -> str:
+        return self.label
+
+    def getMusicInfoTag(self) -> xbmc.InfoTagMusic:
+        return self._tag
+
+    def setArt(self, values: Dict[str, str]) -> None:
+        self.art.update(values)
+
+    def setProperty(self, key: str, value: str) -> None:
+        self.properties[key] = value
+
+    def getProperty(self, key: str) -> str:
+        return self.properties.get(key, "")
+
+    def addContextMenuItems(self, items: List[Tuple[str, str]]) -> None:
+        self.context_menu.extend(items)
+
+    def setMimeType(self, mimetype: str) -> None:
+        self.mimetype = mimetype
+
+    def setContentLookup(self, enable: bool) -> None:
+        pass
+
+
+class Window:
+    def __init__(self, id: int = -1) -> None:
+        pass
+
+    def getProperty(self, key: str) -> str:
+        return PROPERTIES.get(key, "")
+
+    def setProperty(self, key: str, value: str) -> None:
+        PROPERTIES[key] = value
+
+    def clearProperty(self, key: str) -> None:
+        PROPERTIES.pop(key, None)
+
+
+class Dialog:
+    def notification(self, *args: Any) -> None:
+        NOTIFICATIONS.append(args)
+
+    def ok(self, *args: Any) -> bool:
+        NOTIFICATIONS.append(args)
+        return True
+
+    def select(self, *args: Any) -> int:
+        return -1
+
+
+class DialogProgressBG:
+    def create(self, *args: Any) -> None:
+        pass
+
+    def update(self, *args: Any) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class WindowXMLDialog(Window):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    def doModal(self) -> None:
+        pass
+
+
+class ControlEdit:
+    pass
+
+
+class ControlList:
+    pass
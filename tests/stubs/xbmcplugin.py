@@ -0,0 +1,55 @@
+"""Headless stub of Kodi `xbmcplugin` module. Directory is recorded."""
+
+import time
+from typing import Any, List, Optional, Tuple
+
+import xbmcgui
+
+SORT_METHOD_NONE, SORT_METHOD_LABEL, SORT_METHOD_TRACKNUM = 0, 1, 7
+
+ITEMS: List[Tuple[str, xbmcgui.ListItem, bool]] = []
+"""Added directory items (url, item, is folder)"""
+
+CONTENT: Optional[str] = None
+CATEGORY: Optional[str] = None
+ENDED: Optional[float] = None
+"""Time of `endOfDirectory` call (`time.perf_counter`)"""
+
+
+def reset() -> None:
+    """Clears recorded directory before next invocation."""
+
+    global CONTENT, CATEGORY, ENDED
+    ITEMS.clear()
+    CONTENT = CATEGORY = ENDED = None
+
+
+def addDirectoryItem(
+    handle: int, url: str, listitem: xbmcgui.ListItem, isFolder: bool = False, *_
+) -> bool:
+    ITEMS.append((url, listitem, isFolder))
+    return True
+
+
+def addDirectoryItems(handle: int, items: List[Any], totalItems: int = 0) -> bool:
+    ITEMS.extend(items)
+    return True
+
+
+def addSortMethod(handle: int, sortMethod: int, *_) -> None:
+    pass
+
+
+def setContent(handle: int, content: str) -> None:
+    global CONTENT
+    CONTENT = content
+
+
+def setPluginCategory(handle: int, category: str) -> None:
+    global CATEGORY
+    CATEGORY = category
+
+
+def endOfDirectory(handle: int, succeeded: bool = True, *_) -> None:
+    global ENDED
+    ENDED = time.perf_counter()
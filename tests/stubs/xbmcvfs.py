@@ -0,0 +1,25 @@
+"""Headless stub of Kodi `xbmcvfs` module.
+
+`special://` paths are mapped to `KODI_HOME` directory (temporary one by
+default)."""
+
+import os
+import tempfile
+
+HOME = os.environ.get("KODI_HOME") or tempfile.mkdtemp(prefix="kodi-")
+
+
+def translatePath(path: str) -> str:
+    if path.startswith("special://"):
+        return os.path.join(HOME, *path[len("special://") :].split("/"))
+
+    return path
+
+
+def mkdirs(path: str) -> bool:
+    os.makedirs(path, exist_ok=True)
+    return True
+
+
+def makeLegalFilename(path: str) -> str:
+    return path
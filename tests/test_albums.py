@@ -0,0 +1,65 @@
+import os
+import struct
+import zlib
+
+from resources.lib.zophar import browser
+from resources.lib.zophar.albums import AlbumStore
+from resources.lib.zophar.parsers import AudioFormat
+from resources.lib.zophar.transport import Transport
+
+TRACKS = {
+    "Album/01 Stored.mp3": (os.urandom(100_000), 0, False),
+    "Album/02 Deflated.mp3": (bytes(range(256)) * 1000, 8, False),
+    "readme.txt": (b"not extracted" * 100, 8, True),
+    "Album/03 Descriptor.mp3": (b"track" * 30_000, 8, True),
+}
+"""Archive entries: data, compression method and data descriptor flag"""
+
+
+def _entry(name: str, data: bytes, method: int, descriptor: bool) -> bytes:
+    crc, body = zlib.crc32(data), data
+
+    if method == 8:
+        z = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        body = z.compress(data) + z.flush()
+
+    # Sizes and CRC of entry with data descriptor follow its data.
+    sizes = (crc, len(body), len(data))
+    flags, known = (0x08, (0, 0, 0)) if descriptor else (0, sizes)
+    header = (b"PK\x03\x04", 20, flags, method, 0, 0, *known, len(name), 0)
+    result = struct.pack("<4sHHHHHIIIHH", *header) + name.encode() + body
+
+    if descriptor:
+        result += struct.pack("<4sIII", b"PK\x07\x08", *sizes)
+
+    return result
+
+
+def _archive() -> bytes:
+    entries = b"".join(_entry(name, *x) for name, x in TRACKS.items())
+    # Central directory is not read by streaming extraction.
+    return entries + b"PK\x01\x02" + bytes(42)
+
+
+def test_download(site, offline, tmp_path):
+    server = site({"/album.zip": _archive()})
+    browser.set_transport(Transport())
+    store = AlbumStore(str(tmp_path / "albums"), 10**7)
+    url, mp3 = server.url + "/album.zip", AudioFormat.MP3
+
+    # Download is aborted after first entry and resumed from second one.
+    assert not store.download("/album", url, mp3, lambda done, total: False)
+    assert store.tracks("/album", mp3) is None
+    assert store.download("/album", url, mp3)
+
+    name = next(iter(TRACKS))
+    offset = len(_entry(name, *TRACKS[name]))
+    assert [x for _, x in server.served] == [None, f"bytes={offset}-"]
+
+    tracks = store.tracks("/album", mp3)
+    names = [x for x in TRACKS if x.endswith(".mp3")]
+    assert [os.path.basename(x) for x in tracks] == [x[6:] for x in names]
+
+    for path, name in zip(tracks, names):
+        with open(path, "rb") as f:
+            assert f.read() == TRACKS[name][0]
@@ -0,0 +1,36 @@
+from urllib.parse import urlencode
+
+from resources.lib.zophar import browser
+from resources.lib.zophar.cache import PageCache
+from resources.lib.zophar.transport import Transport
+
+
+def test_search_pages(site, offline, fixture):
+    html, query = fixture("gamelist_page1"), {"search": "x", "search_consoleid": "0"}
+    routes = {f"/music/search?{urlencode(sorted(query.items()))}": html}
+
+    for n in (2, 3):
+        params = sorted({**query, "page": str(n)}.items())
+        routes[f"/music/search?{urlencode(params)}"] = html
+
+    browser.set_base_url(site(routes).url)
+    browser.set_transport(Transport())
+    browser.set_cache(None)
+    result = browser.search("x", "0")
+
+    assert (result.page, result.total_pages) == (1, 1)
+    assert len(result.entries) == 600
+
+
+def test_prefetch(site, offline, fixture, tmp_path):
+    server = site({"/music/virtual-boy": fixture("gamelist")})
+    browser.set_base_url(server.url)
+    browser.set_transport(transport := Transport())
+    browser.set_cache(cache := PageCache(str(tmp_path / "cache.db"), 10**7))
+    browser.prefetch([("/music/virtual-boy", {})], 10**6, lambda: False)
+
+    # Prefetched page is stored with its snapshot and shown without request.
+    assert (entry := cache.get("/music/virtual-boy")) and entry.parsed
+    transport.stats.clear()
+    assert len(browser.page("/music/virtual-boy").entries) == 14
+    assert not transport.stats
@@ -0,0 +1,124 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from resources.lib.zophar import browser, cache
+from resources.lib.zophar.cache import PageCache
+from resources.lib.zophar.parsers import parse_page
+from resources.lib.zophar.snapshot import dumps_page
+from resources.lib.zophar.transport import Transport
+
+
+@pytest.fixture
+def pages(tmp_path) -> PageCache:
+    return PageCache(str(tmp_path / "cache.db"), 100)
+
+
+def test_ttl(pages):
+    pages.put("/fresh", "a", 60, etag='"1"', last_modified="Mon")
+    pages.put("/expired", "b", -1)
+
+    assert (x := pages.get("/fresh")) and x.fresh
+    assert (x.body, x.etag, x.last_modified, x.parsed) == ("a", '"1"', "Mon", None)
+    # Expired entry is kept for revalidation.
+    assert (x := pages.get("/expired")) and not x.fresh
+    assert pages.get("/missing") is None
+
+    pages.touch("/expired", 60)
+    assert (x := pages.get("/expired")) and x.fresh
+
+
+def test_eviction(pages, monkeypatch):
+    monkeypatch.setattr(cache, "ACCESS_RESOLUTION", 0)
+    pages.put("/a", "a" * 40, 60)
+    pages.put("/b", "b" * 40, 60)
+    pages.get("/a")
+
+    # Least recently used entry is evicted over size cap.
+    pages.put("/c", "c" * 40, 60)
+    assert [pages.get(x) is None for x in ("/a", "/b", "/c")] == [False, True, False]
+
+
+def test_parsed(pages):
+    pages.put("/a", "a" * 40, 60)
+    pages.put_parsed("/a", bytes(30))
+    assert (x := pages.get("/a")) and x.parsed == bytes(30)
+
+    # Snapshot counts to size: without it both pages would fit.
+    pages.put("/b", "b" * 40, 60)
+    assert pages.get("/a") is None
+
+    # Snapshot is dropped with body it was parsed from.
+    pages.put_parsed("/b", b"snapshot")
+    pages.put("/b", "new", 60)
+    assert (x := pages.get("/b")) and x.parsed is None
+
+
+def test_revalidation(site, offline, fixture, tmp_path):
+    html = fixture("infopage")
+    server = site({"/music/developers": html}, {"ETag": '"v1"'})
+    browser.set_base_url(server.url)
+    browser.set_transport(transport := Transport())
+    browser.set_cache(pages := PageCache(str(tmp_path / "cache.db"), 10**7))
+    pages.put("/music/developers", html, -1, etag='"v1"')
+
+    # Unchanged page is not downloaded again, and it is fresh again.
+    assert browser.get_page("/music/developers") == html
+    assert [x.status for x in transport.stats] == [304]
+    assert (x := pages.get("/music/developers")) and x.fresh
+
+    # Changed page replaces cached one.
+    pages.put("/music/developers", "old", -1, etag='"v0"')
+    assert browser.get_page("/music/developers") == html
+    assert (x := pages.get("/music/developers")) and x.etag == '"v1"'
+
+
+def test_claim(tmp_path):
+    path = str(tmp_path / "cache.db")
+    # Connections of two processes.
+    pages, other = PageCache(path, 100), PageCache(path, 100)
+
+    assert pages.claim("/a", 60)
+    assert not other.claim("/a", 60) and other.in_flight("/a")
+    pages.release("/a")
+    assert not other.in_flight("/a") and other.claim("/a", 60)
+
+    # Mark of killed process expires.
+    assert other.claim("/b", -1)
+    assert not pages.in_flight("/b") and pages.claim("/b", 60)
+
+
+def test_single_flight(site, offline, fixture, tmp_path):
+    html, path = fixture("infopage"), "/music/developers"
+    browser.set_base_url(site({path: html}, latency=0.2).url)
+    browser.set_transport(transport := Transport())
+    browser.set_cache(PageCache(str(tmp_path / "cache.db"), 10**7))
+
+    # Concurrent threads share one request.
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda _: browser.page(path), range(4)))
+
+    assert len(transport.stats) == 1
+    assert all(x == results[0] for x in results)
+
+
+def test_other_process_flight(site, offline, fixture, tmp_path):
+    html, path = fixture("infopage"), "/music/developers"
+    browser.set_base_url(site({path: html}).url)
+    browser.set_transport(transport := Transport())
+    browser.set_cache(PageCache(str(tmp_path / "cache.db"), 10**7))
+    other = PageCache(str(tmp_path / "cache.db"), 10**7)
+
+    def _fetch() -> None:
+        time.sleep(0.2)
+        other.put(path, html, 60)
+        other.put_parsed(path, dumps_page(parse_page(html)))
+        other.release(path)
+
+    # Page fetched by other process is waited for and taken from cache.
+    assert other.claim(path, 60)
+    threading.Thread(target=_fetch).start()
+    assert browser.page(path) == parse_page(html)
+    assert not transport.stats
@@ -0,0 +1,35 @@
+from resources.lib.zophar import browser
+from resources.lib.zophar.cache import PageCache
+from resources.lib.zophar.catalog import Catalog, crawl
+from resources.lib.zophar.parsers import Browsable, GameEntry
+from resources.lib.zophar.transport import Transport
+
+
+def _entry(name, console=None):
+    return GameEntry(name, f"/music/x/{name}", None, None, console, None)
+
+
+def test_consoles(tmp_path):
+    catalog = Catalog(str(tmp_path / "catalog.db"))
+    catalog.update([_entry("a", "NES"), _entry("b")])
+    assert catalog.consoles() == ["NES"]
+
+    catalog.update([_entry("c")], "Virtual Boy")
+    assert sorted(catalog.consoles()) == ["NES", "Virtual Boy"]
+
+
+def test_crawl(site, offline, fixture, tmp_path):
+    server = site({"/music/virtual-boy?page=1": fixture("gamelist")})
+    browser.set_base_url(server.url)
+    browser.set_transport(Transport())
+    browser.set_cache(cache := PageCache(str(tmp_path / "cache.db"), 10**7))
+    catalog = Catalog(str(tmp_path / "catalog.db"))
+
+    menu = {"Consoles": [Browsable("Virtual Boy", "/music/virtual-boy")]}
+    crawl(catalog, menu)
+
+    assert len(catalog) == 14
+    assert catalog.consoles() == ["Virtual Boy"]
+    assert not catalog.is_outdated("/music/virtual-boy")
+    # Crawled pages do not evict pages of user navigation.
+    assert cache.get("/music/virtual-boy?page=1") is None
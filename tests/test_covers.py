@@ -0,0 +1,23 @@
+from resources.lib.zophar import browser
+from resources.lib.zophar.covers import CoverCache
+from resources.lib.zophar.transport import Transport
+
+
+def test_cover_cache(site, offline, tmp_path):
+    server = site({"/images/a.png": b"\x89PNG" * 256, "/images/b.png": b"\0" * 512})
+    browser.set_transport(Transport())
+    covers = CoverCache(str(tmp_path / "covers"), 1500)
+    a, b = server.url + "/images/a.png", server.url + "/images/b.png"
+
+    # Image not cached yet is remembered and downloaded by `fetch`.
+    assert covers.get(a) is None
+    covers.fetch()
+    assert not covers.missing
+    assert (path := covers.get(a)) and path.endswith(".png")
+
+    with open(path, "rb") as f:
+        assert f.read() == b"\x89PNG" * 256
+
+    # Least recently used image is evicted over quota.
+    covers.fetch([b])
+    assert covers.get(a) is None and covers.get(b) is not None
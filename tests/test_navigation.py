@@ -0,0 +1,17 @@
+from benchmarks import navigate, site
+
+
+def test_navigation():
+    server = site.serve()
+
+    try:
+        cold, cached = navigate.navigate(server.url, rounds=2, trace=False)
+
+    finally:
+        server.shutdown()
+
+    assert [x.name for x in cold] == [x for x, _ in site.NAVIGATION]
+    assert [x.items for x in cold] == [5, 25, 20, 14, 80]
+    assert [x.items for x in cached] == [x.items for x in cold]
+    # Cached views and prefetched game pages need no requests.
+    assert [x.requests for x in cached] == [0] * len(cached)
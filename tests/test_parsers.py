@@ -0,0 +1,124 @@
+import pytest
+from conftest import PAGES
+
+from resources.lib.zophar.parsers import (
+    AudioFormat,
+    GameListPage,
+    GameListStream,
+    GamePage,
+    InfoPage,
+    ParseError,
+    parse_page,
+    parse_searchpage,
+    soup,
+    stream_page,
+)
+
+
+def _reference(parse, html):
+    previous = soup.get_backend()
+    soup.set_backend("html.parser")
+
+    try:
+        return parse(html)
+
+    finally:
+        soup.set_backend(previous)
+
+
+@pytest.mark.parametrize("name", PAGES)
+def test_page_parity(backend, fixture, name):
+    html = fixture(name)
+    assert parse_page(html) == _reference(parse_page, html)
+
+
+def test_searchpage_parity(backend, fixture):
+    html = fixture("searchpage")
+    assert parse_searchpage(html) == _reference(parse_searchpage, html)
+
+
+def test_unsupported_page(backend, fixture):
+    with pytest.raises(ParseError):
+        parse_page(fixture("searchpage"))
+
+
+def _stream(html, size=4096):
+    x = stream_page(html[i : i + size] for i in range(0, len(html), size))
+
+    if not isinstance(x, GameListStream):
+        return x
+
+    entries = list(x.entries)
+    return GameListPage(entries, x.title, x.description, x.page, x.total_pages)
+
+
+@pytest.mark.parametrize("name", PAGES)
+def test_stream_parity(fixture, name):
+    html = fixture(name)
+    assert _stream(html) == _reference(parse_page, html)
+
+
+def test_stream_without_title():
+    page = _stream('<div id="gamelistpage"><table></table></div>')
+    assert (page.title, page.description, page.entries) == ("", "", [])
+
+
+def test_gamelist(backend, fixture):
+    page = parse_page(fixture("gamelist_page1"))
+
+    assert isinstance(page, GameListPage)
+    assert (page.page, page.total_pages) == (1, 3)
+    assert page.title == "Nintendo NES (NSF) Music"
+    assert len(page.entries) == 200
+
+    first, second = page.entries[:2]
+    assert first.name == "Island Warrior Mega & Friends II"
+    assert first.cover is None and first.console is None and first.year is None
+    assert second.cover and "/thumbs_large/" in second.cover
+    # Developer cells linked to developer page and plain ones.
+    assert first.developer == "Konami" and second.developer == "Capcom"
+    assert second.year == "1984"
+
+
+def test_search_results(backend, fixture):
+    page = parse_page(fixture("search_results"))
+
+    assert isinstance(page, GameListPage)
+    assert (page.page, page.total_pages) == (1, 1)
+    assert len(page.entries) == 37
+    assert all(x.console == "NES" for x in page.entries)
+
+
+def test_search_empty(backend, fixture):
+    page = parse_page(fixture("search_empty"))
+    assert page == GameListPage([], "Search Results", page.description, 1, 1)
+
+
+def test_gamepage(backend, fixture):
+    page = parse_page(fixture("gamepage"))
+
+    assert isinstance(page, GamePage)
+    assert (page.name, page.console) == ("Star Force", "NES")
+    assert page.release_date == "Aug 31st, 1987"
+    assert page.publisher and page.publisher.startswith("Tecmo")
+    assert page.has_format(AudioFormat.FLAC)
+    assert page.originals and page.originals.endswith("(NSF).zip")
+    assert len(page.tracks) == 80
+    assert page.tracks[6].title == "Boss Battle & Victory"
+
+
+def test_infopage(backend, fixture):
+    page = parse_page(fixture("infopage"))
+
+    assert isinstance(page, InfoPage)
+    assert page.description == "Game developers"
+    assert page.entries[0].name == "Capcom"
+    assert page.entries[0].path == "/music/developer/capcom"
+
+
+def test_searchpage(backend, fixture):
+    menu, platforms = parse_searchpage(fixture("searchpage"))
+
+    assert list(menu) == ["Consoles", "Computers", "Music By Letter", "Info"]
+    assert menu["Info"][1].name == "Top 100 Games"
+    assert platforms["NES"] == "12"
@@ -0,0 +1,31 @@
+import json
+
+from resources.lib.zophar import browser
+from resources.lib.zophar.cache import PageCache
+from resources.lib.zophar.parsers import parse_page
+from resources.lib.zophar.playlist import build_playlist
+from resources.lib.zophar.transport import Transport
+
+
+def test_build_playlist(site, offline, fixture, tmp_path):
+    games = parse_page(html := fixture("gamelist")).entries
+    routes = {"/music/virtual-boy?page=1": html}
+    routes.update((x.path, fixture("gamepage")) for x in games)
+    browser.set_base_url(site(routes).url)
+    browser.set_transport(Transport())
+    browser.set_cache(cache := PageCache(str(tmp_path / "cache.db"), 10**7))
+    file, state = str(tmp_path / "all.m3u"), str(tmp_path / "state.json")
+
+    # Checkpoint without part file: build is restarted from the beginning.
+    with open(state, "w") as f:
+        json.dump({"path": "/music/virtual-boy", "done": 8, "size": 4096}, f)
+
+    assert build_playlist("/music/virtual-boy", file, state)
+
+    with open(file) as f:
+        lines = f.read().splitlines()
+
+    assert lines[0] == "#EXTM3U"
+    assert len(lines) == 1 + 2 * 80 * len(games)
+    # Game pages do not evict pages of user navigation.
+    assert cache.get(games[0].path) is None
@@ -0,0 +1,93 @@
+import os
+import socket
+import threading
+import time
+from typing import Iterator
+
+import pytest
+import requests
+
+from resources.lib.zophar import browser, proxy
+from resources.lib.zophar.proxy import StreamProxy
+from resources.lib.zophar.transport import Transport
+from resources.lib.zophar.urls import proxy_url
+
+TRACKS = {"/a.mp3": os.urandom(5000), "/b.mp3": os.urandom(5000)}
+
+
+@pytest.fixture
+def local_proxy(offline, monkeypatch) -> Iterator[StreamProxy]:
+    monkeypatch.setattr(proxy, "READ_AHEAD", 1000)
+    browser.set_transport(Transport())
+    server = StreamProxy(hosts=("127.0.0.1",))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _read_ahead(server: StreamProxy, url: str) -> None:
+    server.read_ahead(url)
+
+    for _ in range(100):
+        if server.buffered(url):
+            return
+
+        time.sleep(0.01)
+
+    raise TimeoutError(url)
+
+
+@pytest.mark.parametrize("ranges", [True, False])
+def test_buffered(site, local_proxy, ranges):
+    upstream = site(TRACKS, ranges=ranges)
+    a, b = upstream.url + "/a.mp3", upstream.url + "/b.mp3"
+    port = local_proxy.server_port
+
+    response = requests.get(proxy_url(port, a, b))
+    assert response.content == TRACKS["/a.mp3"]
+    _read_ahead(local_proxy, b)
+
+    # Head of the next track is buffered, and its tail is requested after
+    # buffer. Remote ignoring range is forwarded as is.
+    response = requests.get(proxy_url(port, b))
+    assert response.status_code == 200
+    assert response.content == TRACKS["/b.mp3"]
+    tail, full = ("/b.mp3", "bytes=1000-"), ("/b.mp3", None)
+    expected = [tail] if ranges else [tail, full]
+    assert upstream.served[-len(expected) :] == expected
+
+    response = requests.get(proxy_url(port, b), headers={"Range": "bytes=600-"})
+    assert response.status_code == (206 if ranges else 200)
+    assert response.content == TRACKS["/b.mp3"][600 if ranges else 0 :]
+
+
+def test_head(site, local_proxy):
+    upstream = site(TRACKS)
+    b = upstream.url + "/b.mp3"
+    _read_ahead(local_proxy, b)
+    served = len(upstream.served)
+
+    # Buffered stream is described without requests.
+    response = requests.head(proxy_url(local_proxy.server_port, b))
+    assert response.status_code == 200
+    assert response.headers["Content-Length"] == "5000"
+    assert not response.content and len(upstream.served) == served
+
+
+def test_forbidden(local_proxy):
+    url = proxy_url(local_proxy.server_port, "http://example.com/a.mp3")
+    assert requests.get(url).status_code == 403
+
+    url = proxy_url(local_proxy.server_port, "http://127.0.0.1/a.mp3", "file:///x")
+    assert requests.get(url).status_code == 403
+
+
+def test_remote_failure(local_proxy):
+    # Player gets error instead of waiting for response forever.
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        url = f"http://127.0.0.1:{s.getsockname()[1]}/a.mp3"
+
+    response = requests.get(proxy_url(local_proxy.server_port, url), timeout=5)
+    assert response.status_code == 502
@@ -0,0 +1,27 @@
+from resources.lib.zophar import browser
+from resources.lib.zophar.replay import RecordingTransport, ReplayTransport
+
+PAGES = {
+    "/music/developers": "infopage",
+    "/music/virtual-boy": "gamelist",
+    "/music/virtual-boy/galaxy-rescue-1": "gamepage",
+}
+
+
+def test_record_replay(site, offline, fixture, tmp_path):
+    server = site({path: fixture(name) for path, name in PAGES.items()})
+    browser.set_base_url(server.url)
+    browser.set_cache(None)
+    recorded = str(tmp_path / "recorded")
+
+    browser.set_transport(RecordingTransport(recorded))
+    online = [browser.page(x) for x in PAGES]
+
+    # Replayed navigation does not depend on host and network.
+    browser.set_base_url("http://offline.invalid")
+    browser.set_transport(transport := ReplayTransport(recorded))
+    assert [browser.page(x) for x in PAGES] == online
+    assert [x.status for x in transport.stats] == [200] * len(PAGES)
+
+    response = transport.get(browser.BASE_URL + "/music/missing")
+    assert response.status_code == 404
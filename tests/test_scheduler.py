@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from resources.lib.zophar.scheduler import POLL_INTERVAL, Priority, RateLimiter
+
+
+def test_rate(tmp_path):
+    limiter = RateLimiter(str(tmp_path / "limiter.db"), rate=50, burst=1)
+    start = time.monotonic()
+
+    for _ in range(6):
+        limiter.acquire(Priority.NAVIGATION)
+
+    # First request is sent at once, next ones at rate.
+    assert time.monotonic() - start == pytest.approx(0.1, abs=0.05)
+
+
+def test_priority(tmp_path):
+    path = str(tmp_path / "limiter.db")
+    # Limiters of other processes share bucket. Tokens are not refilled.
+    limiter, other = RateLimiter(path, 1e-6, 4), RateLimiter(path, 1e-6, 4)
+
+    # Crawl leaves half of bucket, prefetch quarter to higher priorities.
+    assert limiter._try_acquire("a", Priority.CRAWL) == 0
+    assert other._try_acquire("b", Priority.CRAWL) == 0
+    assert limiter._try_acquire("a", Priority.CRAWL) > 0
+    assert other._try_acquire("b", Priority.PREFETCH) == 0
+    assert limiter._try_acquire("c", Priority.PREFETCH) > 0
+
+    # Lower priority yields to waiting higher one.
+    assert other._try_acquire("d", Priority.NAVIGATION) == 0
+    assert other._try_acquire("d", Priority.NAVIGATION) > 0
+    assert limiter._try_acquire("a", Priority.PREFETCH) == POLL_INTERVAL
+
+
+def test_throttled(tmp_path):
+    limiter = RateLimiter(str(tmp_path / "limiter.db"), rate=1, burst=1)
+    limiter.report(429, retry_after=0.2)
+
+    # All requests are paused, and bucket is refilled at half rate.
+    assert limiter._try_acquire("a", Priority.NAVIGATION) == pytest.approx(0.2, 0.1)
+    time.sleep(0.2)
+    assert limiter._try_acquire("a", Priority.NAVIGATION) == pytest.approx(1.8, 0.05)
+    assert limiter._penalty == 2
+
+    # Rate is restored gradually by successful requests.
+    limiter.report(200)
+    limiter._try_acquire("a", Priority.NAVIGATION)
+    assert limiter._penalty == pytest.approx(1.8)
+
+
+def test_parameters(tmp_path):
+    path = str(tmp_path / "limiter.db")
+    RateLimiter(path, rate=4, burst=8)
+
+    # Limiter with same parameters does not write to database.
+    assert RateLimiter(path, rate=4, burst=8)._db.total_changes == 0
+    assert RateLimiter(path, rate=2, burst=8)._db.total_changes > 0
+    db = RateLimiter(path, rate=2, burst=8)._db
+    assert db.execute("PRAGMA journal_mode").fetchone() == ("wal",)
@@ -0,0 +1,104 @@
+import datetime as dt
+import random
+import string
+from pathlib import Path
+
+import pytest
+from conftest import PAGES
+
+from resources.lib.zophar.parsers import (
+    AudioFormat,
+    AudioTrack,
+    Browsable,
+    GameEntry,
+    GameListPage,
+    GamePage,
+    InfoPage,
+    parse_page,
+    parse_searchpage,
+)
+from resources.lib.zophar.snapshot import (
+    dump_searchpage,
+    dumps_page,
+    load_searchpage,
+    loads_page,
+)
+
+BUNDLED = Path(__file__).parents[1] / "resources" / "searchpage.bin"
+
+
+def test_searchpage_snapshot(fixture, tmp_path):
+    menu, platforms = parse_searchpage(fixture("searchpage"))
+    dump_searchpage(path := str(tmp_path / "searchpage.bin"), menu, platforms)
+
+    assert load_searchpage(path) == (menu, platforms)
+
+
+def test_searchpage_snapshot_invalid(tmp_path):
+    (path := tmp_path / "searchpage.bin").write_bytes(b"ZPH\x01")
+
+    assert load_searchpage(str(path)) is None
+    assert load_searchpage(str(tmp_path / "missing.bin")) is None
+
+
+@pytest.mark.skipif(not BUNDLED.exists(), reason="built on release")
+def test_bundled_searchpage():
+    assert (result := load_searchpage(str(BUNDLED))) is not None
+
+    menu, platforms = result
+    assert "Consoles" in menu and platforms
+
+
+# Alphabet of generated strings: ASCII, markup, Cyrillic, CJK and astral.
+_ALPHABET = string.printable + "&<>\"'\u0416\u044f\u6f22\U0001f3ae"
+
+
+def _str(rnd):
+    return "".join(rnd.choices(_ALPHABET, k=rnd.choice((0, 1, 5, 40))))
+
+
+def _opt(rnd):
+    return None if rnd.random() < 0.3 else _str(rnd)
+
+
+def _gamelistpage(rnd):
+    entries = [
+        GameEntry(_str(rnd), _str(rnd), *(_opt(rnd) for _ in range(4)))
+        for _ in range(rnd.randrange(50))
+    ]
+    pages = rnd.randrange(1, 10)
+    return GameListPage(entries, _str(rnd), _str(rnd), rnd.randint(1, pages), pages)
+
+
+def _gamepage(rnd):
+    formats = rnd.sample(list(AudioFormat), rnd.randrange(len(AudioFormat) + 1))
+    tracks = (
+        AudioTrack(_str(rnd), dt.timedelta(seconds=rnd.randrange(2**32)), _str(rnd))
+        for _ in range(rnd.randrange(30))
+    )
+    return GamePage(
+        _str(rnd),
+        _str(rnd),
+        *(_opt(rnd) for _ in range(5)),
+        archives={x: _str(rnd) for x in formats},
+        tracks=tuple(tracks),
+    )
+
+
+def _infopage(rnd):
+    entries = [Browsable(_str(rnd), _str(rnd)) for _ in range(rnd.randrange(30))]
+    return InfoPage(entries, _str(rnd))
+
+
+@pytest.mark.parametrize("make", [_gamelistpage, _gamepage, _infopage])
+@pytest.mark.parametrize("seed", range(50))
+def test_snapshot_roundtrip(make, seed):
+    page = make(random.Random(seed))
+    assert loads_page(data := dumps_page(page)) == page
+    assert dumps_page(loads_page(data)) == data
+
+
+@pytest.mark.parametrize("name", PAGES)
+def test_page_snapshot(fixture, name):
+    page = parse_page(fixture(name))
+    assert loads_page(dumps_page(page)) == page